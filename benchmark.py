@@ -0,0 +1,212 @@
+# Reproducible benchmark suite for the lab graphs.
+#
+#   python benchmark.py run --output results.json
+#   python benchmark.py compare baseline.json results.json --threshold 0.10
+#
+# Every case runs on seeded synthetic graphs, is timed with perf_counter after warmup runs and
+# reports the median and percentiles of its repetitions plus the tracemalloc peak of one extra run.
+# compare flags every case whose median got slower than the baseline by more than the threshold.
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import ex1
+import ex2
+import ex3
+import ex4
+import ex5
+
+# name -> (nodes, edges); sparse graphs have an average degree of 4, dense ones of 40
+SIZES = {
+    '1k-sparse': (1000, 2000),
+    '1k-dense': (1000, 20000),
+    '10k-sparse': (10000, 20000),
+    '10k-dense': (10000, 200000),
+    '100k-sparse': (100000, 200000),
+}
+DEFAULT_SIZES = ['1k-sparse', '1k-dense', '10k-sparse']
+
+# slowSP scans an unsorted list for every pop, so it only runs on small graphs
+SLOW_SP_MAX_NODES = 1000
+
+def randomEdges(num_nodes, num_edges, seed):
+    rng = random.Random(seed)
+    return [(rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(1, 100)) for _ in range(num_edges)]
+
+# Edges only go from a lower to a higher id, so the graph is acyclic
+def randomDagEdges(num_nodes, num_edges, seed):
+    rng = random.Random(seed)
+    edges = []
+    for _ in range(num_edges):
+        node1, node2 = rng.sample(range(num_nodes), 2)
+        edges.append((min(node1, node2), max(node1, node2), rng.randint(1, 100)))
+    return edges
+
+def writeDot(path, edges):
+    with open(path, 'w') as f:
+        f.write("strict graph G {\n")
+        for node1, node2, weight in edges:
+            f.write(f"\t{node1} -- {node2}\t[weight={weight}];\n")
+        f.write("}\n")
+
+def buildGraph(module, num_nodes, edges, **kwargs):
+    graph = module.Graph(**kwargs)
+    nodes = [graph.addNode(i) for i in range(num_nodes)]
+    for node1, node2, weight in edges:
+        graph.addEdge(nodes[node1], nodes[node2], weight)
+    return graph, nodes
+
+def percentile(samples, fraction):
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+# Times run(setup()) with setup excluded; output printed by the graph code is swallowed
+def measure(setup, run, warmup, repeat):
+    samples = []
+    with contextlib.redirect_stdout(io.StringIO()):
+        for iteration in range(warmup + repeat):
+            state = setup()
+            start_time = time.perf_counter()
+            run(state)
+            elapsed = time.perf_counter() - start_time
+            if iteration >= warmup:
+                samples.append(elapsed)
+
+        state = setup()
+        tracemalloc.start()
+        run(state)
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    return {
+        'median': statistics.median(samples),
+        'p10': percentile(samples, 0.10),
+        'p90': percentile(samples, 0.90),
+        'min': min(samples),
+        'max': max(samples),
+        'peak_memory': peak_memory,
+        'samples': len(samples),
+    }
+
+# (name, setup, run) triples for one graph size; setup builds fresh state for every repetition
+def cases(size, seed, directory):
+    num_nodes, num_edges = SIZES[size]
+    edges = randomEdges(num_nodes, num_edges, seed)
+    dag_edges = randomDagEdges(num_nodes, num_edges, seed)
+    dot_path = os.path.join(directory, f"{size}.dot")
+    writeDot(dot_path, edges)
+
+    sp_graph, sp_nodes = buildGraph(ex2, num_nodes, edges)
+    mst_graph, _ = buildGraph(ex3, num_nodes, edges)
+    dfs_graph, dfs_nodes = buildGraph(ex4, num_nodes, edges)
+    dfs_frozen = dfs_graph.freeze()
+    dag_graph, _ = buildGraph(ex5, num_nodes, dag_edges)
+    source = sp_nodes[0]
+
+    yield 'importFromFile', lambda: ex1.Graph(), lambda graph: graph.importFromFile(dot_path)
+    yield 'addNode+addEdge', lambda: None, lambda _: buildGraph(ex1, num_nodes, edges)
+    # the component structure is built on the first query, so every run gets a fresh graph
+    yield 'components', lambda: buildGraph(ex1, num_nodes, edges)[0], lambda graph: graph.componentCount()
+    if num_nodes <= SLOW_SP_MAX_NODES:
+        yield 'slowSP', lambda: None, lambda _: sp_graph.slowSP(source)
+    yield 'fastSP', lambda: None, lambda _: sp_graph.fastSP(source)
+    yield 'mst', lambda: None, lambda _: mst_graph.mst()
+    yield 'dfs', lambda: None, lambda _: dfs_graph.dfs(dfs_nodes[0])
+    yield 'csr dfs', lambda: None, lambda _: dfs_frozen.dfs(0)
+    yield 'isdag', lambda: None, lambda _: dag_graph.isdag()
+    yield 'toposort', lambda: None, lambda _: dag_graph.toposort()
+
+def runSuite(sizes, seed, warmup, repeat):
+    results = {}
+    with tempfile.TemporaryDirectory() as directory:
+        for size in sizes:
+            for name, setup, run in cases(size, seed, directory):
+                key = f"{name}/{size}"
+                try:
+                    results[key] = measure(setup, run, warmup, repeat)
+                except (RecursionError, MemoryError) as error:
+                    results[key] = {'error': f"{type(error).__name__}: {error}"}
+                print(f"{key}: {formatResult(results[key])}", file=sys.stderr)
+
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'seed': seed,
+            'warmup': warmup,
+            'repeat': repeat,
+            'sizes': {size: SIZES[size] for size in sizes},
+        },
+        'results': results,
+    }
+
+def formatResult(result):
+    if 'error' in result:
+        return result['error']
+    return (f"median {result['median'] * 1e3:.3f}ms, p90 {result['p90'] * 1e3:.3f}ms, "
+            f"peak {result['peak_memory'] / 1024:.0f}KiB")
+
+# Returns the keys whose median slowed down by more than threshold (0.10 = 10%)
+def compare(baseline, current, threshold):
+    regressions = []
+    for key, result in current['results'].items():
+        before = baseline['results'].get(key)
+        if before is None or 'median' not in before or 'median' not in result:
+            continue
+        ratio = result['median'] / before['median']
+        flag = 'REGRESSION' if ratio > 1 + threshold else ''
+        if flag:
+            regressions.append(key)
+        print(f"{key:32} {before['median'] * 1e3:10.3f}ms -> {result['median'] * 1e3:10.3f}ms  {ratio:6.2f}x  {flag}")
+    return regressions
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Graph benchmark suite")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = commands.add_parser('run', help="run the suite and write JSON results")
+    run_parser.add_argument('--output', default='-', help="results file, '-' for stdout")
+    run_parser.add_argument('--sizes', default=','.join(DEFAULT_SIZES), help=f"comma separated, from {', '.join(SIZES)}")
+    run_parser.add_argument('--seed', type=int, default=338)
+    run_parser.add_argument('--warmup', type=int, default=1)
+    run_parser.add_argument('--repeat', type=int, default=7)
+
+    compare_parser = commands.add_parser('compare', help="flag regressions against a saved baseline")
+    compare_parser.add_argument('baseline')
+    compare_parser.add_argument('current')
+    compare_parser.add_argument('--threshold', type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        sizes = [size for size in args.sizes.split(',') if size]
+        unknown = [size for size in sizes if size not in SIZES]
+        if unknown:
+            parser.error(f"unknown sizes: {', '.join(unknown)}")
+        results = runSuite(sizes, args.seed, args.warmup, args.repeat)
+        output = json.dumps(results, indent=2)
+        if args.output == '-':
+            print(output)
+        else:
+            with open(args.output, 'w') as f:
+                f.write(output + '\n')
+        return 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    regressions = compare(baseline, current, args.threshold)
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
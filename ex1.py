@@ -1,112 +1,132 @@
-class GraphNode:
-    def __init__(self, data):
-        self.data = data
-        
-    def equals(self, node):
-        if(node.data == self.data):
-            return True
-        return False
-
-class Graph:
-    def __init__(self):
-        self.adjacency_list = {}
-        self.nodeList = []
-
-    def addNode(self, data):
-        node = GraphNode(data)
-        for nodeOb in self.nodeList:
-            if node.equals(nodeOb):
-                return nodeOb
-
-        self.adjacency_list[node] = []
-        self.nodeList.append(node)
-        return node
-
-    def removeNode(self, node):
-        if node in self.adjacency_list:
-            del self.adjacency_list[node]
-            for key in self.adjacency_list:
-                self.adjacency_list[key] = [n for n in self.adjacency_list[key] if n != node]
-
-    def addEdge(self, n1, n2, weight=1):
-        if n1 in self.adjacency_list and n2 in self.adjacency_list:
-            self.adjacency_list[n1].append((n2, weight))
-            self.adjacency_list[n2].append((n1, weight))
-
-    def removeEdge(self, n1, n2):
-        if n1 in self.adjacency_list and n2 in self.adjacency_list:
-            self.adjacency_list[n1] = [(node, weight) for node, weight in self.adjacency_list[n1] if node != n2]
-            self.adjacency_list[n2] = [(node, weight) for node, weight in self.adjacency_list[n2] if node != n1]
+import gc
+import random
+import time
 
+from graphcore import AdjacencyGraph
+
+class Graph(AdjacencyGraph):
+    # the lab's importFromFile hands back the imported node list
     def importFromFile(self, file):
-        self.adjacency_list = {}
-        self.nodeList = []
-        try:
-            with open(file, 'r') as f:
-                lines = f.readlines()
-
-            # Check if the file starts with the expected format
-            if len(lines) < 2 or not lines[0].startswith("strict graph"):
-                print("Invalid GraphViz file format.")
-                return None
-
-            # Parse the lines to extract nodes and edges
-            for line in lines[1:]:
-                line = line.strip()
-                if line and line[0] != '}':
-                    if "[" in line and "]" in line:
-                        # If weight is specified
-                        parts = line.split('--')
-                        if len(parts) == 2:
-                            nodes = [n.strip() for n in parts]
-                            weight = int(line.split('weight=')[1].split(']')[0].strip())     
-                            n1 = self.addNode(int( nodes[0]))
-                            n2 = self.addNode(int((nodes[1])[0:-13]))
-                            self.addEdge(n1, n2, weight)
-                    else:
-                        # If weight is not specified (implicitly 1)
-                        parts = line.split('--')
-                        if len(parts) == 2:
-                            nodes = [n.strip() for n in parts]
-                            n1 = self.addNode(nodes[0])
-                            n2 = self.addNode(nodes[1])
-                            self.addEdge(n1, n2)
-
-            print("Graph imported successfully.")
-            return self.nodeList
-
-        except FileNotFoundError:
-            print("File not found.")
+        if super().importFromFile(file) is None:
             return None
-
-
-
-# Testing the Graph class
-
-# Create a new graph
-graph = Graph()
-
-
-node1 = graph.addNode("node1")
-node2 = graph.addNode("node2")
-node3 = graph.addNode("node3")
-node4 = graph.addNode("node4")
-
-# Add edges
-graph.addEdge(node1, node2, 5)
-graph.addEdge(node2, node3)
-graph.addEdge(node4, node3, 6)
-
-# Remove an edge
-graph.removeEdge(node1, node2)
-
-# Import from file
-imported_graph = Graph()
-imported_graph.importFromFile("random.dot")
-
-# Print the adjacency list
-print("Original Graph:")
-print(graph.adjacency_list)
-
-print("\nImported Graph:")
-print(imported_graph.adjacency_list if imported_graph else "Graph import failed.")
+        return self.nodeList
+
+# Bulk-load random edge lists of increasing size; with the node index the time per edge should stay flat
+def measureLoadTimes(sizes):
+    times = []
+    for size in sizes:
+        rng = random.Random(size)
+        num_nodes = max(2, size // 4)
+        edges = [(rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(1, 100)) for _ in range(size)]
+
+        # like timeit, keep the cyclic GC out of the measurement
+        graph = Graph()
+        gc.collect()
+        gc.disable()
+        start_time = time.perf_counter()
+        graph.addEdges(edges)
+        times.append(time.perf_counter() - start_time)
+        gc.enable()
+    return times
+
+# Delete 10% of the nodes of a random graph, then insert them again with fresh edges
+def measureChurnTimes(num_nodes, degree, keyed):
+    rng = random.Random(num_nodes)
+    graph = Graph(keyed)
+    graph.addNodes(range(num_nodes))
+    graph.addEdges((rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(1, 100))
+                   for _ in range(num_nodes * degree // 2))
+    churn = rng.sample(range(num_nodes), num_nodes // 10)
+    new_edges = [(data, rng.randrange(num_nodes), rng.randint(1, 100)) for data in churn for _ in range(degree // 2)]
+
+    gc.collect()
+    gc.disable()
+    start_time = time.perf_counter()
+    for data in churn:
+        graph.removeNode(graph.nodeIndex[data])
+    delete_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for data1, data2, weight in new_edges:
+        graph.addEdge(graph.addNode(data1), graph.addNode(data2), weight)
+    insert_time = time.perf_counter() - start_time
+    gc.enable()
+    return delete_time, insert_time
+
+# Label the components of a random graph from scratch, then answer a batch of connected()
+# queries and keep the labelling current over a stream of single-edge inserts
+def measureComponentTimes(num_nodes, num_edges, num_queries=100000):
+    rng = random.Random(num_edges)
+    graph = Graph()
+    graph.addNodes(range(num_nodes))
+    graph.addEdges((rng.randrange(num_nodes), rng.randrange(num_nodes), 1) for _ in range(num_edges))
+    nodes = graph.nodeList
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(num_queries)]
+    new_edges = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(num_queries)]
+
+    gc.collect()
+    gc.disable()
+    start_time = time.perf_counter()
+    count = graph.componentCount()
+    label_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    graph.connected(pairs)
+    query_time = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for n1, n2 in new_edges:
+        graph.addEdge(n1, n2)
+    insert_time = time.perf_counter() - start_time
+    gc.enable()
+    return count, label_time, query_time, insert_time
+
+
+
+if __name__ == "__main__":
+    # Testing the Graph class
+
+    # Create a new graph
+    graph = Graph()
+
+
+    node1 = graph.addNode("node1")
+    node2 = graph.addNode("node2")
+    node3 = graph.addNode("node3")
+    node4 = graph.addNode("node4")
+
+    # Add edges
+    graph.addEdge(node1, node2, 5)
+    graph.addEdge(node2, node3)
+    graph.addEdge(node4, node3, 6)
+
+    # Remove an edge
+    graph.removeEdge(node1, node2)
+
+    # Import from file
+    imported_graph = Graph()
+    imported_graph.importFromFile("random.dot")
+
+    # Print the adjacency list
+    print("Original Graph:")
+    print(graph.adjacency_list)
+
+    print("\nImported Graph:")
+    print(imported_graph.adjacency_list if imported_graph else "Graph import failed.")
+
+    # Load time scaling from 1k to 1M edges
+    sizes = [1000, 10000, 100000, 1000000]
+    load_times = measureLoadTimes(sizes)
+    print("\nBulk load times:")
+    for size, load_time in zip(sizes, load_times):
+        print(f"{size} edges - {load_time:.4f}s ({load_time / size * 1e6:.3f} us/edge)")
+
+    # Churn on a 100k node graph with list and keyed adjacency
+    for keyed in (False, True):
+        delete_time, insert_time = measureChurnTimes(100000, 8, keyed)
+        print(f"{'Keyed' if keyed else 'List'} adjacency churn - delete: {delete_time:.4f}s, insert: {insert_time:.4f}s")
+
+    # Connected components of a 1M node, 3M edge graph
+    count, label_time, query_time, insert_time = measureComponentTimes(1000000, 3000000)
+    print(f"Components - {count} found in {label_time:.2f}s, 100k connected() queries: {query_time:.3f}s, "
+          f"100k tracked edge inserts: {insert_time:.3f}s")
@@ -1,78 +1,108 @@
+import functools
 import heapq
+import itertools
+import json
+import mmap
+import multiprocessing
+import os
+import random
+import struct
+import sys
 import time
+import zlib
 import statistics
-import matplotlib.pyplot as plt
+from array import array
+from collections import OrderedDict
 
-class GraphNode:
-    def __init__(self, data):
-        self.data = data
+from graphcore import AdjacencyGraph, CSRBase, Instrumented, csrArrays, weightTypecode
 
+# Largest edge weight for which the bucket-queue shortest path (dialSP) is auto-selected
+DIAL_MAX_WEIGHT = 1000
 
-class Graph:
-    def __init__(self):
-        self.adjacency_list = {}
+# Frozen graphs handed to allPairsSP workers, one slot per running call: a slot is set before the
+# pool forks, so every worker inherits the CSR arrays instead of receiving a pickled copy per task
+WORKER_STATE = {}
+ALL_PAIRS_CALLS = itertools.count()
 
-    def addNode(self, data):
-        node = GraphNode(data)
-        self.adjacency_list[node] = []
-        return node
+# Binary snapshot layout: header, CSR offsets, targets, weights, then the node id table as JSON.
+# Every array section starts on an 8-byte boundary so it can be cast straight out of the mmap.
+# The crc32 covers the other header fields and the payload.
+SNAPSHOT_MAGIC = b'GSNP'
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct('<4sIQQQ4sI')  # magic, version, nodes, entries, table bytes, weight type, crc32
 
-    def removeNode(self, node):
-        if node in self.adjacency_list:
-            del self.adjacency_list[node]
-            for key in self.adjacency_list:
-                self.adjacency_list[key] = [n for n in self.adjacency_list[key] if n != node]
+def snapshotChecksum(header_fields, payload):
+    return zlib.crc32(payload, zlib.crc32(header_fields))
 
-    def addEdge(self, n1, n2, weight=1):
-        if n1 in self.adjacency_list and n2 in self.adjacency_list:
-            self.adjacency_list[n1].append((n2, weight))
-            self.adjacency_list[n2].append((n1, weight))
+class Graph(Instrumented, AdjacencyGraph):
+    def __init__(self, keyed=False):
+        super().__init__(keyed)
+        # queue pushes/pops and edge relaxations of the last shortest-path call; kept alongside
+        # the Stats of enableStats for the scripts that read it directly
+        self.counters = {}
+        # (version, bound) of the last dialWeightBound computation; dialWeightBound and the
+        # SPCache are tagged with the version every mutation bumps
+        self.dialBound = None
+        # optional SPCache for cachedSP, see enableCache
+        self.cache = None
 
-    def removeEdge(self, n1, n2):
-        if n1 in self.adjacency_list and n2 in self.adjacency_list:
-            self.adjacency_list[n1] = [(node, weight) for node, weight in self.adjacency_list[n1] if node != n2]
-            self.adjacency_list[n2] = [(node, weight) for node, weight in self.adjacency_list[n2] if node != n1]
+    # Immutable array-backed copy for read-only workloads, ids follow adjacency_list order
+    def freeze(self):
+        return CSRGraph(*csrArrays(self))
 
-    def importFromFile(self, file):
-        self.adjacency_list = {}
+    def saveSnapshot(self, path):
+        self.freeze().saveSnapshot(path)
 
+    @staticmethod
+    def loadSnapshot(path, verify=True):
+        # the edge arrays stay in the mapped file, only the node id table becomes Python objects
         try:
-            with open(file, 'r') as f:
-                lines = f.readlines()
+            with open(path, 'rb') as f:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except FileNotFoundError:
+            print("File not found.")
+            return None
+        except ValueError:
+            # mmap refuses empty files
+            print("Invalid snapshot file.")
+            return None
 
-            # Check if the file starts with the expected format
-            if len(lines) < 2 or not lines[0].startswith("strict graph"):
-                print("Invalid GraphViz file format.")
+        view = memoryview(buffer)
+        try:
+            if len(view) < SNAPSHOT_HEADER.size:
+                raise ValueError("truncated header")
+            magic, version, node_count, entry_count, table_size, weight_type, checksum = SNAPSHOT_HEADER.unpack_from(view)
+            if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+                raise ValueError("unknown format")
+            if verify and snapshotChecksum(view[:SNAPSHOT_HEADER.size - 4], view[SNAPSHOT_HEADER.size:]) != checksum:
+                print("Snapshot checksum mismatch.")
                 return None
 
-            # Parse the lines to extract nodes and edges
-            for line in lines[1:]:
-                line = line.strip()
-                if line and line[0] != '}':
-                    if "[" in line and "]" in line:
-                        # If weight is specified
-                        parts = line.split('--')
-                        if len(parts) == 2:
-                            nodes = [n.strip() for n in parts]
-                            weight = int(line.split('weight=')[1].split(']')[0].strip())
-                            n1 = self.addNode(nodes[0])
-                            n2 = self.addNode(nodes[1])
-                            self.addEdge(n1, n2, weight)
-                    else:
-                        # If weight is not specified (implicitly 1)
-                        parts = line.split('--')
-                        if len(parts) == 2:
-                            nodes = [n.strip() for n in parts]
-                            n1 = self.addNode(nodes[0])
-                            n2 = self.addNode(nodes[1])
-                            self.addEdge(n1, n2)
-
-            print("Graph imported successfully.")
-            return self
-
-        except FileNotFoundError:
-            print("File not found.")
+            # without verify the counts are still checked against the file length, so a damaged
+            # file is rejected here instead of failing somewhere inside the sections
+            weight_type = weight_type.rstrip(b'\0').decode()
+            if weight_type not in ('i', 'q', 'd'):
+                raise ValueError("unknown weight type")
+            position = SNAPSHOT_HEADER.size
+            sections = []
+            for typecode, count in (('q', node_count + 1), ('i', entry_count), (weight_type, entry_count)):
+                size = count * array(typecode).itemsize
+                if position + size > len(view):
+                    raise ValueError("truncated section")
+                sections.append(view[position:position + size].cast(typecode))
+                position += size + (-size % 8)
+            if position + table_size > len(view):
+                raise ValueError("truncated node table")
+            table = json.loads(bytes(view[position:position + table_size]))
+            if not isinstance(table, list) or len(table) != node_count:
+                raise ValueError("node table does not match the header")
+            # JSON has no tuples, so tuple node ids come back as lists
+            nodes = [tuple(node) if isinstance(node, list) else node for node in table]
+        except ValueError:
+            # JSONDecodeError and UnicodeDecodeError are ValueErrors too
+            print("Invalid snapshot file.")
             return None
+        return CSRGraph(nodes, *sections)
 
 # the slower implementation would be an unsorted Array or List
 class Node:
@@ -97,13 +127,143 @@ class UnsortedArrayQueue:
 class MinHeapQueue:
     def __init__(self):
         self.heap = []
+        self.count = 0
+        self.pops = 0
     
     def insert(self, node):
-        heapq.heappush(self.heap, (node.dist, node))
+        # the insertion counter breaks distance ties so Node objects are never compared
+        heapq.heappush(self.heap, (node.dist, self.count, node))
+        self.count += 1
     
     def extract_min(self):
-        return heapq.heappop(self.heap)[1]
+        self.pops += 1
+        return heapq.heappop(self.heap)[2]
+
+# d-ary heap with a vertex -> slot index, so a vertex is queued at most once and an improved
+# distance moves its existing entry up instead of pushing a stale duplicate
+class IndexedHeapQueue:
+    def __init__(self, d=4):
+        self.d = d
+        self.keys = []
+        self.vertices = []
+        self.position = {}
+        self.pushes = 0
+        self.pops = 0
+
+    def __contains__(self, vertex):
+        return vertex in self.position
+
+    def insert(self, node):
+        self.pushes += 1
+        self.keys.append(node.dist)
+        self.vertices.append(node.vertex)
+        self.sift_up(len(self.keys) - 1)
+
+    def decrease_key(self, vertex, dist):
+        index = self.position[vertex]
+        self.keys[index] = dist
+        self.sift_up(index)
+
+    def extract_min(self):
+        self.pops += 1
+        keys = self.keys
+        vertices = self.vertices
+        min_node = Node(vertices[0], keys[0])
+        del self.position[min_node.vertex]
+
+        last_key = keys.pop()
+        last_vertex = vertices.pop()
+        if keys:
+            keys[0] = last_key
+            vertices[0] = last_vertex
+            self.sift_down(0)
+        return min_node
+
+    def sift_up(self, index):
+        keys = self.keys
+        vertices = self.vertices
+        position = self.position
+        key = keys[index]
+        vertex = vertices[index]
+        while index > 0:
+            parent = (index - 1) // self.d
+            if keys[parent] <= key:
+                break
+            keys[index] = keys[parent]
+            vertices[index] = vertices[parent]
+            position[vertices[index]] = index
+            index = parent
+        keys[index] = key
+        vertices[index] = vertex
+        position[vertex] = index
+
+    def sift_down(self, index):
+        keys = self.keys
+        vertices = self.vertices
+        position = self.position
+        size = len(keys)
+        key = keys[index]
+        vertex = vertices[index]
+        while True:
+            first = self.d * index + 1
+            if first >= size:
+                break
+            child = min(range(first, min(first + self.d, size)), key=keys.__getitem__)
+            if keys[child] >= key:
+                break
+            keys[index] = keys[child]
+            vertices[index] = vertices[child]
+            position[vertices[index]] = index
+            index = child
+        keys[index] = key
+        vertices[index] = vertex
+        position[vertex] = index
     
+# LRU cache of per-source distance maps with an entry and an approximate byte budget. An entry
+# costs its dict's hash table plus one float-sized object per distance, an upper bound when the
+# distances are small ints that Python shares; the node keys belong to the graph and are not
+# counted. All entries belong to one graph version; the first lookup after a mutation drops them.
+class SPCache:
+    def __init__(self, max_entries=256, max_bytes=None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+        self.version = None
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, source, version):
+        if version != self.version:
+            self.invalidations += len(self.entries)
+            self.entries.clear()
+            self.bytes = 0
+            self.version = version
+
+        entry = self.entries.get(source)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(source)
+        self.hits += 1
+        return entry[0]
+
+    def put(self, source, distances):
+        size = sys.getsizeof(distances) + len(distances) * sys.getsizeof(0.0)
+        self.entries[source] = (distances, size)
+        self.bytes += size
+        while self.entries and ((self.max_entries is not None and len(self.entries) > self.max_entries)
+                                or (self.max_bytes is not None and self.bytes > self.max_bytes)):
+            _, (_, evicted_size) = self.entries.popitem(last=False)
+            self.bytes -= evicted_size
+            self.evictions += 1
+
+    def stats(self):
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'invalidations': self.invalidations, 'entries': len(self.entries), 'bytes': self.bytes}
+
 class Graph(Graph):
     # Using Dijkstra's Algorithm with an Unsorted Array
     def slowSP(self, start_node):
@@ -115,7 +275,7 @@ class Graph(Graph):
 
         while queue.nodes:
             current_node = queue.extract_min().vertex
-            for neighbor, weight in self.adjacency_list[current_node]:
+            for neighbor, weight in self.neighbors(current_node):
                 distance = distances[current_node] + weight
                 if distance < distances[neighbor]:
                     distances[neighbor] = distance
@@ -125,81 +285,913 @@ class Graph(Graph):
 
     # Using Dijkstra's Algorithm with a Min-Heap
     def fastSP(self, start_node):
+        stats = self.startStats('fastSP')
         distances = {node: float('infinity') for node in self.adjacency_list}
         distances[start_node] = 0
         
         queue = MinHeapQueue()
         queue.insert(Node(start_node, 0))
+        if stats:
+            stats.phase('init')
 
+        relaxations = stale = 0
         while queue.heap:
-            current_node = queue.extract_min().vertex
-            for neighbor, weight in self.adjacency_list[current_node]:
+            current = queue.extract_min()
+            current_node = current.vertex
+            # a vertex improved after it was queued leaves a stale entry behind
+            if current.dist > distances[current_node]:
+                stale += 1
+                continue
+            neighbors = self.neighbors(current_node)
+            relaxations += len(neighbors)
+            for neighbor, weight in neighbors:
                 distance = distances[current_node] + weight
                 if distance < distances[neighbor]:
                     distances[neighbor] = distance
                     queue.insert(Node(neighbor, distance))
 
+        self.counters = {'pushes': queue.count, 'pops': queue.pops, 'relaxations': relaxations}
+        if stats:
+            stats.phase('search')
+            self.finishStats(stats, stale_pops=stale, **self.counters)
         return distances
-    
-# Initialize the graph
-graph = Graph()
-
-# Assume that the file 'random.dot' is in the current working directory
-graph.importFromFile('random.dot')
-
-# Performance measurement for slowSP
-slow_times = []
-for node in graph.adjacency_list.keys():
-    start_time = time.time()
-    graph.slowSP(node)
-    end_time = time.time()
-    slow_times.append(end_time - start_time)
-
-# Performance measurement for fastSP
-fast_times = []
-for node in graph.adjacency_list.keys():
-    start_time = time.time()
-    graph.fastSP(node)
-    end_time = time.time()
-    fast_times.append(end_time - start_time)
-
-# Calculate and print the performance metrics for slowSP
-slow_average_time = statistics.mean(slow_times)
-slow_max_time = max(slow_times)
-slow_min_time = min(slow_times)
-
-print(f"SlowSP - Average Time: {slow_average_time}")
-print(f"SlowSP - Max Time: {slow_max_time}")
-print(f"SlowSP - Min Time: {slow_min_time}")
-
-# Calculate and print the performance metrics for fastSP
-fast_average_time = statistics.mean(fast_times)
-fast_max_time = max(fast_times)
-fast_min_time = min(fast_times)
-
-print(f"FastSP - Average Time: {fast_average_time}")
-print(f"FastSP - Max Time: {fast_max_time}")
-print(f"FastSP - Min Time: {fast_min_time}")
-
-# Plot histogram for slowSP execution times
-plt.hist(slow_times, bins=20, alpha=0.5, label='slowSP')
-
-# Plot histogram for fastSP execution times
-plt.hist(fast_times, bins=20, alpha=0.5, label='fastSP')
-
-plt.xlabel('Execution Time (seconds)')
-plt.ylabel('Frequency')
-plt.title('Histogram of Execution Times for slowSP and fastSP')
-plt.legend(loc='upper right')
-
-plt.savefig('ex2.jpeg')
-
-"""
-Discussion of Results:
-The slowSP method uses an unsorted array and should typically show a wider distribution with a higher average
-execution time due to its inefficient node selection logic.The fastSP method uses a min-heap and should have a
-narrower distribution with a lower average execution time, reflecting its more efficient node selection logic.
-The histograms will allow you to visualize the spread and central tendency of the execution times for both
-methods. The comparison between the two histograms will highlight the performance difference, with fastSP
-expected to be clustered towards lower execution times.
-"""
+
+    # Using Dijkstra's Algorithm with an indexed d-ary heap and decrease-key: every vertex is
+    # popped and expanded exactly once
+    def indexedSP(self, start_node, d=4):
+        stats = self.startStats('indexedSP')
+        distances = {node: float('infinity') for node in self.adjacency_list}
+        distances[start_node] = 0
+
+        queue = IndexedHeapQueue(d)
+        queue.insert(Node(start_node, 0))
+        if stats:
+            stats.phase('init')
+
+        relaxations = 0
+        while queue.keys:
+            current = queue.extract_min()
+            neighbors = self.neighbors(current.vertex)
+            relaxations += len(neighbors)
+            for neighbor, weight in neighbors:
+                distance = current.dist + weight
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    if neighbor in queue:
+                        queue.decrease_key(neighbor, distance)
+                    else:
+                        queue.insert(Node(neighbor, distance))
+
+        self.counters = {'pushes': queue.pushes, 'pops': queue.pops, 'relaxations': relaxations}
+        if stats:
+            stats.phase('search')
+            self.finishStats(stats, **self.counters)
+        return distances
+
+    # Using Dial's algorithm: for non-negative integer weights up to max_weight, a circular array
+    # of max_weight + 1 buckets indexed by distance replaces the comparison-based heap. Without
+    # max_weight the bound comes from dialWeightBound, and graphs it rejects (float, negative or
+    # too large weights) are handed to fastSP instead. An explicit max_weight is checked against
+    # every relaxed edge: a heavier edge would wrap into a bucket that is drained too early.
+    def dialSP(self, start_node, max_weight=None):
+        checked = max_weight is None
+        if checked:
+            max_weight = self.dialWeightBound()
+            if max_weight < 0:
+                return self.fastSP(start_node)
+        elif type(max_weight) is not int or max_weight < 0:
+            raise ValueError("max_weight must be a non-negative int")
+        stats = self.startStats('dialSP')
+        distances = {node: float('infinity') for node in self.adjacency_list}
+        distances[start_node] = 0
+
+        bucket_count = max_weight + 1
+        buckets = [[] for _ in range(bucket_count)]
+        buckets[0].append(start_node)
+        pushes = pending = 1
+        pops = relaxations = 0
+        if stats:
+            stats.phase('init')
+
+        dist = 0
+        while pending:
+            bucket = buckets[dist % bucket_count]
+            while bucket:
+                current_node = bucket.pop()
+                pending -= 1
+                pops += 1
+                # entries left behind by a later improvement are skipped
+                if distances[current_node] != dist:
+                    continue
+                neighbors = self.neighbors(current_node)
+                relaxations += len(neighbors)
+                for neighbor, weight in neighbors:
+                    if not checked and (type(weight) is not int or not 0 <= weight <= max_weight):
+                        raise ValueError(f"edge weight {weight!r} is not an int between 0 and max_weight")
+                    distance = dist + weight
+                    if distance < distances[neighbor]:
+                        distances[neighbor] = distance
+                        buckets[distance % bucket_count].append(neighbor)
+                        pending += 1
+                        pushes += 1
+            dist += 1
+
+        self.counters = {'pushes': pushes, 'pops': pops, 'relaxations': relaxations}
+        if stats:
+            stats.phase('search')
+            self.finishStats(stats, buckets=bucket_count, **self.counters)
+        return distances
+
+    # Largest edge weight when every weight is a non-negative int up to DIAL_MAX_WEIGHT, otherwise -1
+    def dialWeightBound(self):
+        if self.dialBound is None or self.dialBound[0] != self.version:
+            bound = 0
+            for node in self.adjacency_list:
+                for _, weight in self.neighbors(node):
+                    if type(weight) is not int or weight < 0 or weight > DIAL_MAX_WEIGHT:
+                        bound = -1
+                        break
+                    bound = max(bound, weight)
+                if bound < 0:
+                    break
+            self.dialBound = (self.version, bound)
+        return self.dialBound[1]
+
+    def enableCache(self, max_entries=256, max_bytes=None):
+        self.cache = SPCache(max_entries, max_bytes)
+
+    def disableCache(self):
+        self.cache = None
+
+    # shortestPaths memoized per source while the graph version is unchanged. The returned dict
+    # is shared with the cache and must not be modified.
+    def cachedSP(self, start_node):
+        if self.cache is None:
+            return self.shortestPaths(start_node)
+        distances = self.cache.get(start_node, self.version)
+        if distances is None:
+            distances = self.shortestPaths(start_node)
+            self.cache.put(start_node, distances)
+        return distances
+
+    # Distances from every source, yielded as (source, distances) rows in the same format as
+    # fastSP. Sources are split into chunks and run on the frozen graph in a process pool;
+    # rows are streamed back as chunks finish, so their order is not fixed.
+    def allPairsSP(self, workers=None, chunk_size=16):
+        nodes = list(self.adjacency_list)
+        frozen = self.freeze()
+        if workers is None:
+            workers = os.cpu_count() or 1
+        chunks = [range(start, min(start + chunk_size, len(nodes))) for start in range(0, len(nodes), chunk_size)]
+
+        # without fork the graph cannot be inherited, so the work stays in this process
+        if workers <= 1 or 'fork' not in multiprocessing.get_all_start_methods():
+            results = (allPairsChunk(chunk, frozen) for chunk in chunks)
+            for rows in results:
+                for source_id, row in rows:
+                    yield nodes[source_id], dict(zip(nodes, row))
+            return
+
+        # each call has its own slot, so generators running side by side keep their own graphs
+        key = next(ALL_PAIRS_CALLS)
+        WORKER_STATE[key] = frozen
+        try:
+            with multiprocessing.get_context('fork').Pool(workers) as pool:
+                for rows in pool.imap_unordered(functools.partial(allPairsChunk, key=key), chunks):
+                    for source_id, row in rows:
+                        yield nodes[source_id], dict(zip(nodes, row))
+        finally:
+            del WORKER_STATE[key]
+
+    # Point-to-point query returning (distance, path). The 'dijkstra' mode stops as soon as the
+    # target is settled, 'astar' adds an admissible heuristic(node, target) to the queue key and
+    # 'bidirectional' searches from both ends. Only vertices the search reaches are stored.
+    def shortestPath(self, source, target, mode='dijkstra', heuristic=None):
+        if mode == 'bidirectional':
+            return self.bidirectionalPath(source, target)
+        if mode == 'dijkstra':
+            heuristic = None
+        elif mode != 'astar' or heuristic is None:
+            raise ValueError("mode must be 'dijkstra', 'bidirectional' or 'astar' with a heuristic")
+
+        stats = self.startStats('shortestPath')
+        distances = {source: 0}
+        predecessors = {source: None}
+        heap = [(heuristic(source, target) if heuristic else 0, 0, 0, source)]
+        count = 1
+        settled = 0
+        while heap:
+            _, _, dist, current_node = heapq.heappop(heap)
+            # an entry is stale once a shorter distance to its vertex has been queued
+            if dist > distances[current_node]:
+                continue
+            settled += 1
+            if current_node is target:
+                self.counters = {'settled': settled}
+                if stats:
+                    stats.phase('search')
+                    self.finishStats(stats, pushes=count, **self.counters)
+                return dist, self.buildPath(predecessors, target)
+            for neighbor, weight in self.neighbors(current_node):
+                distance = dist + weight
+                if distance < distances.get(neighbor, float('infinity')):
+                    distances[neighbor] = distance
+                    predecessors[neighbor] = current_node
+                    priority = distance + heuristic(neighbor, target) if heuristic else distance
+                    heapq.heappush(heap, (priority, count, distance, neighbor))
+                    count += 1
+
+        self.counters = {'settled': settled}
+        if stats:
+            stats.phase('search')
+            self.finishStats(stats, pushes=count, **self.counters)
+        return float('infinity'), []
+
+    def bidirectionalPath(self, source, target):
+        stats = self.startStats('bidirectionalPath')
+        # index 0 is the search from source, index 1 the search from target; edges are undirected
+        # so both sides walk the same adjacency lists
+        distances = ({source: 0}, {target: 0})
+        predecessors = ({source: None}, {target: None})
+        heaps = ([(0, 0, source)], [(0, 1, target)])
+        count = 2
+        settled = 0
+        best = 0 if source is target else float('infinity')
+        meeting = source if source is target else None
+
+        while heaps[0] and heaps[1]:
+            if heaps[0][0][0] + heaps[1][0][0] >= best:
+                break
+            side = 0 if heaps[0][0][0] <= heaps[1][0][0] else 1
+            dist, _, current_node = heapq.heappop(heaps[side])
+            if dist > distances[side][current_node]:
+                continue
+            settled += 1
+            other_distances = distances[1 - side]
+            for neighbor, weight in self.neighbors(current_node):
+                distance = dist + weight
+                if distance < distances[side].get(neighbor, float('infinity')):
+                    distances[side][neighbor] = distance
+                    predecessors[side][neighbor] = current_node
+                    heapq.heappush(heaps[side], (distance, count, neighbor))
+                    count += 1
+                if neighbor in other_distances:
+                    total = distances[side][neighbor] + other_distances[neighbor]
+                    if total < best:
+                        best = total
+                        meeting = neighbor
+
+        self.counters = {'settled': settled}
+        if stats:
+            stats.phase('search')
+            self.finishStats(stats, pushes=count, **self.counters)
+        if meeting is None:
+            return float('infinity'), []
+        path = self.buildPath(predecessors[0], meeting)
+        node = predecessors[1][meeting]
+        while node is not None:
+            path.append(node)
+            node = predecessors[1][node]
+        return best, path
+
+    def buildPath(self, predecessors, node):
+        path = []
+        while node is not None:
+            path.append(node)
+            node = predecessors[node]
+        path.reverse()
+        return path
+
+    # Picks the bucket queue when the weights allow it and the binary heap otherwise
+    def shortestPaths(self, start_node):
+        bound = self.dialWeightBound()
+        if bound >= 0:
+            return self.dialSP(start_node, bound)
+        return self.fastSP(start_node)
+
+# Single-source distances kept up to date while edges change. Edge updates go through this
+# object so it can repair only the part of the distance map they affect: insertions and weight
+# decreases re-relax outwards from the improved endpoint, deletions and weight increases use a
+# Ramalingam-Reps style repair that first finds the vertices that lost every shortest path and
+# then recomputes just those from their unaffected neighbors.
+class DynamicSP:
+    def __init__(self, graph, source):
+        self.graph = graph
+        self.source = source
+        self.distances = graph.fastSP(source)
+        # vertices re-examined by the last update
+        self.touched = 0
+
+    def edgeWeight(self, n1, n2):
+        weights = [weight for neighbor, weight in self.graph.neighbors(n1) if neighbor is n2]
+        return min(weights) if weights else None
+
+    def addNode(self, data):
+        node = self.graph.addNode(data)
+        self.distances[node] = float('infinity')
+        return node
+
+    def addEdge(self, n1, n2, weight=1):
+        # keyed graphs overwrite an existing edge, which may raise its weight
+        if self.graph.keyed and self.edgeWeight(n1, n2) is not None:
+            self.setWeight(n1, n2, weight)
+            return
+        self.graph.addEdge(n1, n2, weight)
+        self.touched = 0
+        self.decrease(n1, n2, weight)
+
+    def removeEdge(self, n1, n2):
+        weight = self.edgeWeight(n1, n2)
+        self.graph.removeEdge(n1, n2)
+        self.touched = 0
+        if weight is not None:
+            self.increase(n1, n2, weight)
+
+    def setWeight(self, n1, n2, weight):
+        old_weight = self.edgeWeight(n1, n2)
+        self.graph.removeEdge(n1, n2)
+        self.graph.addEdge(n1, n2, weight)
+        self.touched = 0
+        if old_weight is not None and weight > old_weight:
+            self.increase(n1, n2, old_weight)
+        self.decrease(n1, n2, weight)
+
+    def decrease(self, n1, n2, weight):
+        distances = self.distances
+        heap = []
+        for tail, head in ((n1, n2), (n2, n1)):
+            distance = distances[tail] + weight
+            if distance < distances[head]:
+                distances[head] = distance
+                heap.append((distance, id(head), head))
+        heapq.heapify(heap)
+        self.propagate(heap)
+
+    # Dijkstra from the given queue entries, only following edges that improve a distance
+    def propagate(self, heap, region=None):
+        distances = self.distances
+        while heap:
+            dist, _, current_node = heapq.heappop(heap)
+            if dist > distances[current_node]:
+                continue
+            self.touched += 1
+            for neighbor, weight in self.graph.neighbors(current_node):
+                if region is not None and neighbor not in region:
+                    continue
+                distance = dist + weight
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    heapq.heappush(heap, (distance, id(neighbor), neighbor))
+
+    def increase(self, n1, n2, old_weight):
+        distances = self.distances
+        infinity = float('infinity')
+
+        # Phase 1: in increasing distance order, a candidate is affected unless some unaffected
+        # neighbor with a strictly smaller distance still gives it its exact distance
+        heap = []
+        for tail, head in ((n1, n2), (n2, n1)):
+            if head is not self.source and distances[head] != infinity and distances[tail] + old_weight == distances[head]:
+                heap.append((distances[head], id(head), head))
+        heapq.heapify(heap)
+        affected = set()
+        while heap:
+            dist, _, candidate = heapq.heappop(heap)
+            if candidate in affected:
+                continue
+            self.touched += 1
+            supported = False
+            for neighbor, weight in self.graph.neighbors(candidate):
+                if neighbor not in affected and distances[neighbor] < dist and distances[neighbor] + weight == dist:
+                    supported = True
+                    break
+            if supported:
+                continue
+            affected.add(candidate)
+            for neighbor, weight in self.graph.neighbors(candidate):
+                if neighbor is not self.source and neighbor not in affected and dist + weight == distances[neighbor]:
+                    heapq.heappush(heap, (distances[neighbor], id(neighbor), neighbor))
+
+        # Phase 2: affected vertices restart from their best unaffected neighbor, then settle among themselves
+        heap = []
+        for node in affected:
+            best = infinity
+            for neighbor, weight in self.graph.neighbors(node):
+                if neighbor not in affected and distances[neighbor] + weight < best:
+                    best = distances[neighbor] + weight
+            distances[node] = best
+            if best != infinity:
+                heap.append((best, id(node), node))
+        heapq.heapify(heap)
+        self.propagate(heap, affected)
+
+# Frozen graph for the shortest-path queries. The arrays can be array objects or memoryviews
+# over a mapped snapshot.
+class CSRGraph(CSRBase):
+    def __init__(self, nodes, offsets, targets, weights):
+        super().__init__(nodes, offsets, targets, weights)
+        # per-node distance slots shared by the bounded queries, see scratch()
+        self.scratchDistances = None
+        self.scratchStamps = None
+        self.generation = 0
+
+    # Scratch distances are allocated once and reused by every bounded query. A slot only counts
+    # when its stamp equals the current generation, so starting a query is O(1) instead of O(V).
+    # Queries on one CSRGraph therefore must not run concurrently.
+    def scratch(self):
+        if self.scratchStamps is None or self.generation == 2**31 - 1:
+            self.scratchDistances = array('d', [0]) * len(self.nodes)
+            self.scratchStamps = array('i', [0]) * len(self.nodes)
+            self.generation = 0
+        self.generation += 1
+        return self.scratchDistances, self.scratchStamps, self.generation
+
+    # Vertices within distance radius of the source as parallel (ids, distances) arrays in
+    # increasing distance order
+    def withinRadius(self, source_id, radius):
+        return self.boundedSP(source_id, radius, None)
+
+    # The k vertices closest to the source, the source itself included
+    def kNearest(self, source_id, k):
+        return self.boundedSP(source_id, float('infinity'), k)
+
+    def boundedSP(self, source_id, radius, limit):
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+        distances, stamps, generation = self.scratch()
+        result_ids = array('i')
+        result_distances = array('q' if memoryview(weights).format in 'iq' else 'd')
+        if radius < 0:
+            return result_ids, result_distances
+        distances[source_id] = 0
+        stamps[source_id] = generation
+
+        heap = [(0, source_id)]
+        while heap and len(result_ids) != limit:
+            dist, current = heapq.heappop(heap)
+            if dist > distances[current]:
+                continue
+            result_ids.append(current)
+            result_distances.append(dist)
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                distance = dist + weights[i]
+                if distance <= radius and (stamps[neighbor] != generation or distance < distances[neighbor]):
+                    distances[neighbor] = distance
+                    stamps[neighbor] = generation
+                    heapq.heappush(heap, (distance, neighbor))
+
+        return result_ids, result_distances
+
+    def saveSnapshot(self, path):
+        weight_type = memoryview(self.weights).format
+        table = json.dumps(self.nodes).encode()
+        sections = [memoryview(self.offsets).tobytes(), memoryview(self.targets).tobytes(),
+                    memoryview(self.weights).tobytes(), table]
+        payload = b''.join(section + bytes(-len(section) % 8) for section in sections)
+        fields = (SNAPSHOT_MAGIC, SNAPSHOT_VERSION, len(self.nodes), len(self.targets), len(table),
+                  weight_type.encode().ljust(4, b'\0'))
+        checksum = snapshotChecksum(SNAPSHOT_HEADER.pack(*fields, 0)[:-4], payload)
+        header = SNAPSHOT_HEADER.pack(*fields, checksum)
+        with open(path, 'wb') as f:
+            f.write(header)
+            f.write(payload)
+
+    # Dijkstra over the arrays, returns a list of distances indexed by node id
+    def fastSP(self, start_id):
+        stats = self.startStats('fastSP')
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+        distances = [float('infinity')] * len(self.nodes)
+        distances[start_id] = 0
+        if stats:
+            stats.phase('init')
+
+        heap = [(0, start_id)]
+        pops = stale = 0
+        while heap:
+            dist, current = heapq.heappop(heap)
+            pops += 1
+            if dist > distances[current]:
+                stale += 1
+                continue
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                distance = dist + weights[i]
+                if distance < distances[neighbor]:
+                    distances[neighbor] = distance
+                    heapq.heappush(heap, (distance, neighbor))
+
+        if stats:
+            stats.phase('search')
+            # every push is popped, and only settled vertices scan their edges
+            settled = [vertex for vertex in range(len(distances)) if distances[vertex] != float('infinity')]
+            relaxations = sum(offsets[vertex + 1] - offsets[vertex] for vertex in settled)
+            self.finishStats(stats, pushes=pops, pops=pops, stale_pops=stale, relaxations=relaxations)
+        return distances
+
+# Contraction hierarchy for repeated point-to-point distance queries. Nodes are contracted one at
+# a time in order of importance (shortcuts added minus edges removed, plus contracted neighbors),
+# adding a shortcut between two neighbors whenever no witness path avoiding the contracted node is
+# as short. Every edge is then stored at its lower-ranked end, so a query is a bidirectional
+# Dijkstra that only climbs in rank. The upward graph is a CSRGraph, so it is saved and loaded
+# with the snapshot format.
+class ContractionHierarchy:
+    def __init__(self, upward, shortcuts=None):
+        self.upward = upward
+        self.shortcuts = shortcuts
+        # vertices settled by the last query
+        self.settled = 0
+
+    def nodeId(self, node):
+        return self.upward.nodeId(node)
+
+    @staticmethod
+    def build(graph, witness_limit=50):
+        frozen = graph.freeze()
+        node_count = len(frozen.nodes)
+        infinity = float('infinity')
+        adjacency = [{} for _ in range(node_count)]
+        for node in range(node_count):
+            for i in range(frozen.offsets[node], frozen.offsets[node + 1]):
+                neighbor = frozen.targets[i]
+                if neighbor != node and frozen.weights[i] < adjacency[node].get(neighbor, infinity):
+                    adjacency[node][neighbor] = frozen.weights[i]
+
+        # local Dijkstra from start that skips the node being contracted and gives up after
+        # witness_limit settled vertices; a missed witness only costs an extra shortcut
+        def witnessDistances(start, skipped, bound):
+            distances = {start: 0}
+            heap = [(0, start)]
+            settled = 0
+            while heap and settled < witness_limit:
+                dist, current = heapq.heappop(heap)
+                if dist > distances[current]:
+                    continue
+                if dist > bound:
+                    break
+                settled += 1
+                for neighbor, weight in adjacency[current].items():
+                    distance = dist + weight
+                    if neighbor != skipped and distance < distances.get(neighbor, infinity):
+                        distances[neighbor] = distance
+                        heapq.heappush(heap, (distance, neighbor))
+            return distances
+
+        def findShortcuts(node):
+            neighbors = list(adjacency[node].items())
+            if len(neighbors) < 2:
+                return []
+            max_weight = max(weight for _, weight in neighbors)
+            shortcuts = []
+            for index, (neighbor1, weight1) in enumerate(neighbors[:-1]):
+                witnesses = witnessDistances(neighbor1, node, weight1 + max_weight)
+                for neighbor2, weight2 in neighbors[index + 1:]:
+                    if witnesses.get(neighbor2, infinity) > weight1 + weight2:
+                        shortcuts.append((neighbor1, neighbor2, weight1 + weight2))
+            return shortcuts
+
+        contracted_neighbors = [0] * node_count
+        def priority(node, shortcuts):
+            return len(shortcuts) - len(adjacency[node]) + contracted_neighbors[node]
+
+        heap = [(priority(node, findShortcuts(node)), node) for node in range(node_count)]
+        heapq.heapify(heap)
+        upward = [None] * node_count
+        shortcut_count = 0
+        while heap:
+            _, node = heapq.heappop(heap)
+            # lazy update: priorities go stale as neighbors are contracted
+            shortcuts = findShortcuts(node)
+            node_priority = priority(node, shortcuts)
+            if heap and node_priority > heap[0][0]:
+                heapq.heappush(heap, (node_priority, node))
+                continue
+
+            upward[node] = adjacency[node]
+            for neighbor in adjacency[node]:
+                del adjacency[neighbor][node]
+                contracted_neighbors[neighbor] += 1
+            for neighbor1, neighbor2, weight in shortcuts:
+                if weight < adjacency[neighbor1].get(neighbor2, infinity):
+                    adjacency[neighbor1][neighbor2] = weight
+                    adjacency[neighbor2][neighbor1] = weight
+                    shortcut_count += 1
+            adjacency[node] = None
+
+        offsets = array('q', [0])
+        targets = array('i')
+        weights = []
+        for node in range(node_count):
+            for neighbor, weight in upward[node].items():
+                targets.append(neighbor)
+                weights.append(weight)
+            offsets.append(len(targets))
+        upward = CSRGraph(frozen.nodes, offsets, targets, array(weightTypecode(weights), weights))
+        return ContractionHierarchy(upward, shortcut_count)
+
+    def save(self, path):
+        self.upward.saveSnapshot(path)
+
+    @staticmethod
+    def load(path):
+        upward = Graph.loadSnapshot(path)
+        if upward is None:
+            return None
+        return ContractionHierarchy(upward)
+
+    # Distance between two node ids: both searches only follow upward edges and meet at the
+    # highest-ranked node of the shortest path
+    def query(self, source_id, target_id):
+        offsets = self.upward.offsets
+        targets = self.upward.targets
+        weights = self.upward.weights
+        distances = ({source_id: 0}, {target_id: 0})
+        heaps = ([(0, source_id)], [(0, target_id)])
+        best = float('infinity')
+        settled = 0
+
+        while heaps[0] or heaps[1]:
+            side = 0 if heaps[0] and (not heaps[1] or heaps[0][0][0] <= heaps[1][0][0]) else 1
+            dist, current = heapq.heappop(heaps[side])
+            if dist > distances[side][current]:
+                continue
+            if dist >= best:
+                # nothing left on this side can improve the answer
+                heaps[side].clear()
+                continue
+            settled += 1
+            other = distances[1 - side].get(current)
+            if other is not None and dist + other < best:
+                best = dist + other
+            for i in range(offsets[current], offsets[current + 1]):
+                neighbor = targets[i]
+                distance = dist + weights[i]
+                if distance < distances[side].get(neighbor, float('infinity')):
+                    distances[side][neighbor] = distance
+                    heapq.heappush(heaps[side], (distance, neighbor))
+
+        self.settled = settled
+        return best
+
+# allPairsSP worker: distance rows for a chunk of source ids on the given frozen graph, or on the
+# one the call inherited in its WORKER_STATE slot
+def allPairsChunk(source_ids, frozen=None, key=None):
+    if frozen is None:
+        frozen = WORKER_STATE[key]
+    return [(source_id, frozen.fastSP(source_id)) for source_id in source_ids]
+
+# rows x cols grid with random integer weights of at least 10 per step, so ten times the
+# Manhattan distance is an admissible A* heuristic
+def gridGraph(rows, cols, seed=0):
+    rng = random.Random(seed)
+    grid = Graph()
+    nodes = {(row, col): grid.addNode((row, col)) for row in range(rows) for col in range(cols)}
+    for (row, col), node in nodes.items():
+        if row + 1 < rows:
+            grid.addEdge(node, nodes[(row + 1, col)], rng.randint(10, 100))
+        if col + 1 < cols:
+            grid.addEdge(node, nodes[(row, col + 1)], rng.randint(10, 100))
+    return grid, list(nodes.values())
+
+def gridHeuristic(node, target):
+    return 10 * (abs(node.data[0] - target.data[0]) + abs(node.data[1] - target.data[1]))
+
+if __name__ == "__main__":
+    import matplotlib.pyplot as plt
+
+    # Initialize the graph
+    graph = Graph()
+
+    # Assume that the file 'random.dot' is in the current working directory
+    graph.importFromFile('random.dot')
+
+    # Start-up cost: re-parsing random.dot against mapping a saved binary snapshot
+    graph.saveSnapshot('random.snap')
+    import_times = []
+    snapshot_times = []
+    for _ in range(5):
+        start_time = time.perf_counter()
+        Graph().importFromFile('random.dot')
+        import_times.append(time.perf_counter() - start_time)
+
+        start_time = time.perf_counter()
+        Graph.loadSnapshot('random.snap')
+        snapshot_times.append(time.perf_counter() - start_time)
+
+    print(f"importFromFile - Median Time: {statistics.median(import_times)}")
+    print(f"loadSnapshot - Median Time: {statistics.median(snapshot_times)}")
+
+    # Performance measurement for slowSP
+    slow_times = []
+    for node in graph.adjacency_list.keys():
+        start_time = time.time()
+        graph.slowSP(node)
+        end_time = time.time()
+        slow_times.append(end_time - start_time)
+
+    # Performance measurement for fastSP
+    fast_times = []
+    for node in graph.adjacency_list.keys():
+        start_time = time.time()
+        graph.fastSP(node)
+        end_time = time.time()
+        fast_times.append(end_time - start_time)
+
+    # Performance measurement for dialSP
+    dial_times = []
+    for node in graph.adjacency_list.keys():
+        start_time = time.time()
+        graph.dialSP(node)
+        end_time = time.time()
+        dial_times.append(end_time - start_time)
+
+    # an explicit max_weight below the heaviest edge has to be rejected, not answered wrongly
+    check_graph = Graph()
+    check_a, check_b, check_c = (check_graph.addNode(name) for name in 'abc')
+    check_graph.addEdge(check_a, check_b, 50)
+    check_graph.addEdge(check_b, check_c, 1)
+    assert check_graph.dialSP(check_a, 50) == check_graph.fastSP(check_a)
+    try:
+        check_graph.dialSP(check_a, 10)
+        raise AssertionError("dialSP accepted an edge heavier than max_weight")
+    except ValueError:
+        pass
+
+    # Performance measurement for fastSP on the frozen CSR graph
+    frozen = graph.freeze()
+    csr_times = []
+    for node_id in range(len(frozen.nodes)):
+        start_time = time.time()
+        frozen.fastSP(node_id)
+        end_time = time.time()
+        csr_times.append(end_time - start_time)
+
+    # Calculate and print the performance metrics for slowSP
+    slow_average_time = statistics.mean(slow_times)
+    slow_max_time = max(slow_times)
+    slow_min_time = min(slow_times)
+
+    print(f"SlowSP - Average Time: {slow_average_time}")
+    print(f"SlowSP - Max Time: {slow_max_time}")
+    print(f"SlowSP - Min Time: {slow_min_time}")
+
+    # Calculate and print the performance metrics for fastSP
+    fast_average_time = statistics.mean(fast_times)
+    fast_max_time = max(fast_times)
+    fast_min_time = min(fast_times)
+
+    print(f"FastSP - Average Time: {fast_average_time}")
+    print(f"FastSP - Max Time: {fast_max_time}")
+    print(f"FastSP - Min Time: {fast_min_time}")
+
+    # Calculate and print the performance metrics for dialSP
+    print(f"DialSP - Average Time: {statistics.mean(dial_times)}")
+    print(f"DialSP - Max Time: {max(dial_times)}")
+    print(f"DialSP - Min Time: {min(dial_times)}")
+
+    print(f"CSR fastSP - Average Time: {statistics.mean(csr_times)}")
+    print(f"CSR fastSP - Max Time: {max(csr_times)}")
+    print(f"CSR fastSP - Min Time: {min(csr_times)}")
+
+    # Memory per adjacency entry: lists of (GraphNode, weight) tuples against the CSR arrays
+    entries = len(frozen.targets)
+    list_bytes = sum(sys.getsizeof(neighbors) + sum(sys.getsizeof(entry) for entry in neighbors)
+                     for neighbors in graph.adjacency_list.values())
+    csr_bytes = sum(len(a) * a.itemsize for a in (frozen.offsets, frozen.targets, frozen.weights))
+    print(f"Adjacency list - {list_bytes / entries:.1f} bytes per edge entry")
+    print(f"CSR arrays - {csr_bytes / entries:.1f} bytes per edge entry")
+
+    # All-sources throughput with a growing number of worker processes
+    for workers in range(1, (os.cpu_count() or 1) + 1):
+        start_time = time.perf_counter()
+        rows = sum(1 for _ in graph.allPairsSP(workers))
+        print(f"allPairsSP with {workers} workers - {rows / (time.perf_counter() - start_time):.1f} sources/s")
+
+    # Queue work over all sources of a dense random graph: the indexed heap never re-expands stale vertices
+    rng = random.Random(0)
+    dense_graph = Graph()
+    dense_nodes = [dense_graph.addNode(i) for i in range(200)]
+    for _ in range(10000):
+        dense_graph.addEdge(rng.choice(dense_nodes), rng.choice(dense_nodes), rng.randint(1, 100))
+    for method in (dense_graph.fastSP, dense_graph.indexedSP):
+        totals = {'pushes': 0, 'pops': 0, 'relaxations': 0}
+        start_time = time.perf_counter()
+        for node in dense_nodes:
+            method(node)
+            for key in totals:
+                totals[key] += dense_graph.counters[key]
+        print(f"{method.__name__} on dense graph - {time.perf_counter() - start_time:.3f}s, {totals}")
+
+    # Hub workload: repeated queries from 300 hub sources with an occasional mutation
+    hubs = rng.sample(list(graph.adjacency_list), 300)
+    graph.enableCache(max_entries=200)
+    start_time = time.perf_counter()
+    for query in range(5000):
+        graph.cachedSP(rng.choice(hubs))
+        if query % 1000 == 999:
+            graph.removeNode(graph.addNode('temporary'))
+    print(f"cachedSP hub workload - {time.perf_counter() - start_time:.3f}s, {graph.cache.stats()}")
+    graph.disableCache()
+
+    # Bounded queries on frozen random.dot-sized and 100x larger grids: latency follows the explored region
+    for rows in (32, 316):
+        frozen_grid = gridGraph(rows, rows)[0].freeze()
+        sources = [rng.randrange(len(frozen_grid.nodes)) for _ in range(200)]
+        start_time = time.perf_counter()
+        for source_id in sources:
+            frozen_grid.kNearest(source_id, 50)
+        knearest_time = (time.perf_counter() - start_time) / len(sources)
+        start_time = time.perf_counter()
+        for source_id in sources:
+            frozen_grid.withinRadius(source_id, 150)
+        radius_time = (time.perf_counter() - start_time) / len(sources)
+        print(f"{len(frozen_grid.nodes)} node grid - kNearest(50): {knearest_time * 1e6:.0f}us, withinRadius(150): {radius_time * 1e6:.0f}us")
+
+    # Contraction hierarchy on random.dot and a 10k node grid: preprocessing cost and query speedup
+    # over fastSP, with every query answer checked against fastSP
+    for name, ch_graph, ch_path in (('random.dot', graph, 'random.ch'), ('100x100 grid', gridGraph(100, 100)[0], 'grid.ch')):
+        start_time = time.perf_counter()
+        hierarchy = ContractionHierarchy.build(ch_graph)
+        build_time = time.perf_counter() - start_time
+        shortcut_count = hierarchy.shortcuts
+        hierarchy.save(ch_path)
+        hierarchy = ContractionHierarchy.load(ch_path)
+
+        ch_nodes = list(ch_graph.adjacency_list)
+        pairs = [(rng.randrange(len(ch_nodes)), rng.randrange(len(ch_nodes))) for _ in range(50)]
+        start_time = time.perf_counter()
+        expected = [ch_graph.fastSP(ch_nodes[source_id])[ch_nodes[target_id]] for source_id, target_id in pairs]
+        fast_time = time.perf_counter() - start_time
+        start_time = time.perf_counter()
+        answers = [hierarchy.query(source_id, target_id) for source_id, target_id in pairs]
+        ch_time = time.perf_counter() - start_time
+        assert answers == expected
+        print(f"Contraction hierarchy on {name} - preprocessing {build_time:.2f}s, {shortcut_count} shortcuts, "
+              f"{fast_time / ch_time:.1f}x faster queries than fastSP")
+
+    # Stream of random edge updates on random.dot: incremental repair against full recomputation,
+    # with every repaired distance map checked against fastSP
+    dynamic_graph = Graph(keyed=True)
+    dynamic_graph.importFromFile('random.dot')
+    dynamic_nodes = list(dynamic_graph.adjacency_list)
+    dynamic = DynamicSP(dynamic_graph, dynamic_nodes[0])
+    incremental_time = full_time = 0
+    for update in range(500):
+        node1, node2 = rng.sample(dynamic_nodes, 2)
+        start_time = time.perf_counter()
+        if update % 3 == 0:
+            dynamic.removeEdge(node1, node2)
+        elif update % 3 == 1:
+            dynamic.addEdge(node1, node2, rng.randint(1, 100))
+        else:
+            neighbor, _ = rng.choice(list(dynamic_graph.neighbors(node1)) or [(node2, 0)])
+            dynamic.setWeight(node1, neighbor, rng.randint(1, 100))
+        incremental_time += time.perf_counter() - start_time
+
+        start_time = time.perf_counter()
+        expected = dynamic_graph.fastSP(dynamic.source)
+        full_time += time.perf_counter() - start_time
+        assert expected == dynamic.distances
+    print(f"DynamicSP - {incremental_time:.3f}s incremental against {full_time:.3f}s full recomputation for 500 updates")
+
+    # Point-to-point queries on random.dot-sized and 100x larger grids: average settled vertices per mode
+    for rows in (32, 316):
+        grid, grid_nodes = gridGraph(rows, rows)
+        pairs = [(rng.choice(grid_nodes), rng.choice(grid_nodes)) for _ in range(20)]
+        for mode in ('dijkstra', 'bidirectional', 'astar'):
+            settled = []
+            start_time = time.perf_counter()
+            for source, target in pairs:
+                grid.shortestPath(source, target, mode, gridHeuristic)
+                settled.append(grid.counters['settled'])
+            elapsed = (time.perf_counter() - start_time) / len(pairs)
+            print(f"{len(grid_nodes)} node grid, {mode} - {statistics.mean(settled):.0f} settled, {elapsed:.4f}s per query")
+
+    # Plot histogram for slowSP execution times
+    plt.hist(slow_times, bins=20, alpha=0.5, label='slowSP')
+
+    # Plot histogram for fastSP execution times
+    plt.hist(fast_times, bins=20, alpha=0.5, label='fastSP')
+
+    # Plot histogram for dialSP execution times
+    plt.hist(dial_times, bins=20, alpha=0.5, label='dialSP')
+
+    plt.xlabel('Execution Time (seconds)')
+    plt.ylabel('Frequency')
+    plt.title('Histogram of Execution Times for slowSP, fastSP and dialSP')
+    plt.legend(loc='upper right')
+
+    plt.savefig('ex2.jpeg')
+
+    """
+    Discussion of Results:
+    The slowSP method uses an unsorted array and should typically show a wider distribution with a higher average
+    execution time due to its inefficient node selection logic.The fastSP method uses a min-heap and should have a
+    narrower distribution with a lower average execution time, reflecting its more efficient node selection logic.
+    The histograms will allow you to visualize the spread and central tendency of the execution times for both
+    methods. The comparison between the two histograms will highlight the performance difference, with fastSP
+    expected to be clustered towards lower execution times.
+    """
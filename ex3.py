@@ -1,160 +1,388 @@
+import functools
+import heapq
+import itertools
+import multiprocessing
+import os
+import random
+import time
+from array import array
 
-class GraphNode:
-    def __init__(self, data):
-        self.data = data
+from graphcore import AdjacencyGraph, CSRBase, DisjointSet, Instrumented, csrArrays, weightTypecode
 
-    def equals(self, node):
-        if(node.data == self.data):
-            return True
-        return False
+# mst picks Prim from this average degree on; below it sorting the edge list is cheaper than
+# the heap traffic
+PRIM_MIN_DEGREE = 24
 
-class Graph:
-    def __init__(self):
-        self.adjacency_list = {}
-        self.nodeList = []
+# Arrays of the running boruvkaMst calls by call id, set before the pool forks so workers inherit
+# them; BORUVKA_CALLS hands out the ids
+WORKER_STATE = {}
+BORUVKA_CALLS = itertools.count()
 
-    def addNode(self, data):
-        node = GraphNode(data)
-        for nodeOb in self.nodeList:
-            if node.equals(nodeOb):
-                return nodeOb
+class Graph(Instrumented, AdjacencyGraph):
+    # nodes of another graph are mapped to the ones with the same data
+    def addEdge(self, n1, n2, weight=1):
+        n1 = self.nodeIndex.get(n1.data, n1)
+        n2 = self.nodeIndex.get(n2.data, n2)
+        super().addEdge(n1, n2, weight)
 
-        self.adjacency_list[node] = []
-        self.nodeList.append(node)
-        return node
+    # Immutable array-backed copy for read-only workloads, ids follow adjacency_list order
+    def freeze(self):
+        return CSRGraph(*csrArrays(self))
 
-    def removeNode(self, node):
-        if node in self.adjacency_list:
-            del self.adjacency_list[node]
-            for key in self.adjacency_list:
-                self.adjacency_list[key] = [n for n in self.adjacency_list[key] if n != node]
+    def averageDegree(self):
+        if not self.adjacency_list:
+            return 0
+        return sum(len(neighbors) for neighbors in self.adjacency_list.values()) / len(self.adjacency_list)
 
-    def addEdge(self, n1, n2, weight=1):
-        for nodeOb in self.nodeList:
-            if n1.equals(nodeOb):
-                n1 = nodeOb
-            if n2.equals(nodeOb):
-                n2 = nodeOb
+    # Minimum spanning forest. Kruskal sorts every edge once, Prim only keeps the frontier in a
+    # heap and wins once the graph is dense enough, so by default the algorithm is picked by the
+    # average degree. Passing workers selects the parallel Boruvka engine.
+    def mst(self, algorithm=None, workers=None):
+        if algorithm is None and workers is not None:
+            algorithm = 'boruvka'
+        if algorithm is None:
+            algorithm = 'prim' if self.averageDegree() >= PRIM_MIN_DEGREE else 'kruskal'
+        if algorithm == 'kruskal':
+            return self.kruskalMst()
+        if algorithm == 'prim':
+            return self.primMst()
+        if algorithm == 'boruvka':
+            return self.boruvkaMst(workers)
+        raise ValueError("algorithm must be 'kruskal', 'prim' or 'boruvka'")
 
-        if n1 in self.adjacency_list and n2 in self.adjacency_list:
-            self.adjacency_list[n1].append((n2, weight))
-            self.adjacency_list[n2].append((n1, weight))
+    # Kruskal over dense ids: each undirected edge is taken once from its lower-id end, the
+    # components live in a DisjointSet and the scan stops after V - 1 accepted edges
+    def kruskalMst(self):
+        stats = self.startStats('mst')
+        nodes = self.nodeList
+        ids = {node: i for i, node in enumerate(nodes)}
+        node_count = len(nodes)
 
-    def removeEdge(self, n1, n2):
-        if n1 in self.adjacency_list and n2 in self.adjacency_list:
-            self.adjacency_list[n1] = [(node, weight) for node, weight in self.adjacency_list[n1] if node != n2]
-            self.adjacency_list[n2] = [(node, weight) for node, weight in self.adjacency_list[n2] if node != n1]
+        edges = []
+        for i, node in enumerate(nodes):
+            for neighbor, weight in self.neighbors(node):
+                j = ids[neighbor]
+                if i < j:
+                    edges.append((weight, i, j))
+        if stats:
+            stats.phase('edges')
 
-    def importFromFile(self, file):
-        self.adjacency_list = {}
+        edges.sort(key=lambda x: x[0])
+        if stats:
+            stats.phase('sort')
 
-        try:
-            with open(file, 'r') as f:
-                lines = f.readlines()
-
-            # Check if the file starts with the expected format
-            if len(lines) < 2 or not lines[0].startswith("strict graph"):
-                print("Invalid GraphViz file format.")
-                return None
-
-            # Parse the lines to extract nodes and edges
-            for line in lines[1:]:
-                line = line.strip()
-                if line and line[0] != '}':
-                    if "[" in line and "]" in line:
-                        # If weight is specified
-                        parts = line.split('--')
-                        if len(parts) == 2:
-                            nodes = [n.strip() for n in parts]
-                            weight = int(line.split('weight=')[1].split(']')[0].strip())
-                            n1 = self.addNode(nodes[0])
-                            n2 = self.addNode(nodes[1])
-                            self.addEdge(n1, n2, weight)
-                    else:
-                        # If weight is not specified (implicitly 1)
-                        parts = line.split('--')
-                        if len(parts) == 2:
-                            nodes = [n.strip() for n in parts]
-                            n1 = self.addNode(nodes[0])
-                            n2 = self.addNode(nodes[1])
-                            self.addEdge(n1, n2)
-
-            print("Graph imported successfully.")
-            return self
-
-        except FileNotFoundError:
-            print("File not found.")
-            return None
-
-    def find(self, parent, node):
-        if parent[node] == node:
-            return node
-        return self.find(parent, parent[node])
-
-    def union(self, parent, rank, node1, node2):
-        root1 = self.find(parent, node1)
-        root2 = self.find(parent, node2)
-
-        if rank[root1] < rank[root2]:
-            parent[root1] = root2
-        elif rank[root1] > rank[root2]:
-            parent[root2] = root1
+        disjoint_set = DisjointSet(node_count, count_steps=stats is not None)
+        union = disjoint_set.union
+        tree_edges = []
+        unions = 0
+        for edge in edges:
+            unions += 1
+            if not union(edge[1], edge[2]):
+                continue
+            tree_edges.append(edge)
+            if len(tree_edges) == node_count - 1:
+                break
+        if stats:
+            stats.phase('union')
+
+        result = self.forest(nodes, tree_edges)
+        if stats:
+            stats.phase('build')
+            self.finishStats(stats, edges=len(edges), unions=unions, finds=disjoint_set.finds,
+                             find_steps=disjoint_set.findSteps, components=disjoint_set.count)
+        return result
+
+    # Lazy Prim with a heap of (weight, id, parent id) entries, restarted from every vertex the
+    # previous trees did not reach so disconnected graphs give a forest like Kruskal
+    def primMst(self):
+        stats = self.startStats('mst')
+        nodes = self.nodeList
+        ids = {node: i for i, node in enumerate(nodes)}
+        node_count = len(nodes)
+        in_tree = bytearray(node_count)
+        best = [float('infinity')] * node_count
+        if stats:
+            stats.phase('init')
+
+        tree_edges = []
+        pushes = pops = stale = 0
+        for root in range(node_count):
+            if in_tree[root]:
+                continue
+            heap = [(0, root, root)]
+            pushes += 1
+            while heap:
+                weight, i, parent_id = heapq.heappop(heap)
+                pops += 1
+                if in_tree[i]:
+                    stale += 1
+                    continue
+                in_tree[i] = 1
+                if i != parent_id:
+                    tree_edges.append((weight, parent_id, i))
+                for neighbor, neighbor_weight in self.neighbors(nodes[i]):
+                    j = ids[neighbor]
+                    if not in_tree[j] and neighbor_weight < best[j]:
+                        best[j] = neighbor_weight
+                        heapq.heappush(heap, (neighbor_weight, j, i))
+                        pushes += 1
+        if stats:
+            stats.phase('search')
+
+        result = self.forest(nodes, tree_edges)
+        if stats:
+            stats.phase('build')
+            self.finishStats(stats, pushes=pushes, pops=pops, stale_pops=stale)
+        return result
+
+    # Boruvka rounds: every component picks its cheapest outgoing edge, the picks are merged and the
+    # components contracted, which at least halves their number. One fork pool serves all rounds.
+    # Each worker task owns a slice of the nodes and a slice of the edges: it points its nodes
+    # straight at their component root, drops its edges that now lie inside a component and picks
+    # the cheapest remaining edge per component. The labels and the surviving edge slices live in
+    # shared arrays, so between rounds the parent only merges the picks and relabels the roots
+    # that were joined. Ties are broken by edge index, so the edge order is total and the forest
+    # does not depend on the number of workers.
+    def boruvkaMst(self, workers=None):
+        stats = self.startStats('mst')
+        nodes = self.nodeList
+        ids = {node: i for i, node in enumerate(nodes)}
+        if workers is None:
+            workers = os.cpu_count() or 1
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            workers = 1
+
+        # each undirected edge once, from its lower-id end
+        sources = array('i')
+        targets = array('i')
+        weights = []
+        for i, node in enumerate(nodes):
+            for neighbor, weight in self.neighbors(node):
+                j = ids[neighbor]
+                if i < j:
+                    sources.append(i)
+                    targets.append(j)
+                    weights.append(weight)
+        weights = array(weightTypecode(weights), weights)
+        node_count = len(nodes)
+        edge_count = len(sources)
+        parts = max(1, min(workers, edge_count))
+
+        # label[v] is v's component root, or a root of the previous round that points at it;
+        # alive[start:start + counts[p]] holds the edges of slice p that still join two components
+        if parts > 1:
+            context = multiprocessing.get_context('fork')
+            label = memoryview(context.RawArray('i', node_count)).cast('B').cast('i')
+            alive = memoryview(context.RawArray('i', edge_count)).cast('B').cast('i')
+            counts = memoryview(context.RawArray('i', parts)).cast('B').cast('i')
         else:
-            parent[root2] = root1
-            rank[root1] += 1
+            label = array('i', [0]) * node_count
+            alive = array('i', [0]) * edge_count
+            counts = array('i', [0])
+        label[:] = array('i', range(node_count))
+        alive[:] = array('i', range(edge_count))
+        slices = []
+        for part in range(parts):
+            edge_start = edge_count * part // parts
+            counts[part] = edge_count * (part + 1) // parts - edge_start
+            slices.append((node_count * part // parts, node_count * (part + 1) // parts, edge_start))
+        key = next(BORUVKA_CALLS)
+        WORKER_STATE[key] = (sources, targets, weights, label, alive, counts, slices)
+        if stats:
+            stats.phase('edges')
+
+        disjoint_set = DisjointSet(node_count, count_steps=stats is not None)
+        tree_ids = []
+        rounds = 0
+        pool = None
+        try:
+            if parts > 1:
+                pool = context.Pool(parts)
+            while True:
+                rounds += 1
+                if pool is None:
+                    picks = [boruvkaRound(key, 0)]
+                else:
+                    picks = pool.map(functools.partial(boruvkaRound, key), range(parts))
 
+                best = {}
+                for partition in picks:
+                    for root, k in partition.items():
+                        current = best.get(root)
+                        if current is None or (weights[k], k) < (weights[current], current):
+                            best[root] = k
+                if not best:
+                    break
+
+                # two components can pick the same edge, the union-find keeps it once
+                for k in sorted(set(best.values())):
+                    if disjoint_set.union(sources[k], targets[k]):
+                        tree_ids.append(k)
+                # every root that picked an edge was joined, the workers relabel the other nodes
+                find = disjoint_set.find
+                for root in best:
+                    label[root] = find(root)
+        finally:
+            if pool is not None:
+                pool.terminate()
+            del WORKER_STATE[key]
+        if stats:
+            stats.phase('rounds')
+
+        tree_ids.sort()
+        result = self.forest(nodes, [(weights[k], sources[k], targets[k]) for k in tree_ids])
+        if stats:
+            stats.phase('build')
+            self.finishStats(stats, edges=edge_count, rounds=rounds, workers=parts,
+                             finds=disjoint_set.finds, find_steps=disjoint_set.findSteps)
+        return result
+
+    # Builds the result graph from (weight, id1, id2) tree edges in one bulk addEdges call
+    def forest(self, nodes, tree_edges):
+        result = Graph(self.keyed)
+        result.addEdges((nodes[i].data, nodes[j].data, weight) for weight, i, j in tree_edges)
+        return result
+
+# One Boruvka round over slice part of the call's nodes and edges, see boruvkaMst. Returns the
+# cheapest outgoing edge of every component seen in the slice as {root: edge index}; within a
+# slice the edges stay in index order, so the first of equal weights is the lowest index.
+def boruvkaRound(key, part):
+    sources, targets, weights, label, alive, counts, slices = WORKER_STATE[key]
+    node_start, node_end, edge_start = slices[part]
+    # contract: the roots joined in the last round point at the new root, one hop resolves them
+    for v in range(node_start, node_end):
+        label[v] = label[label[v]]
+
+    best = {}
+    keep = edge_start
+    for position in range(edge_start, edge_start + counts[part]):
+        k = alive[position]
+        root1 = label[label[sources[k]]]
+        root2 = label[label[targets[k]]]
+        if root1 == root2:
+            continue
+        alive[keep] = k
+        keep += 1
+        weight = weights[k]
+        current = best.get(root1)
+        if current is None or weight < weights[current]:
+            best[root1] = k
+        current = best.get(root2)
+        if current is None or weight < weights[current]:
+            best[root2] = k
+    counts[part] = keep - edge_start
+    return best
+
+# Frozen graph for the spanning-tree queries
+class CSRGraph(CSRBase):
+    # Kruskal over the arrays: each undirected edge is taken once from its lower-id end and
+    # the components live in a DisjointSet
     def mst(self):
-        parent = {}
-        rank = {}
-        result = Graph()
+        stats = self.startStats('mst')
+        offsets = self.offsets
+        targets = self.targets
+        weights = self.weights
+        node_count = len(self.nodes)
 
-        for node in self.adjacency_list:
-            parent[node] = node
-            rank[node] = 0
+        sources = array('i')
+        entries = array('q')
+        for node in range(node_count):
+            for i in range(offsets[node], offsets[node + 1]):
+                if node < targets[i]:
+                    sources.append(node)
+                    entries.append(i)
+        if stats:
+            stats.phase('edges')
+        order = sorted(range(len(entries)), key=lambda k: weights[entries[k]])
+        if stats:
+            stats.phase('sort')
 
-        edges = []
-        for node in self.adjacency_list:
-            for neighbor, weight in self.adjacency_list[node]:
-                edges.append((weight, node, neighbor))
+        disjoint_set = DisjointSet(node_count, count_steps=stats is not None)
+        union = disjoint_set.union
+        tree_edges = []
+        unions = 0
+        for k in order:
+            unions += 1
+            if not union(sources[k], targets[entries[k]]):
+                continue
+            tree_edges.append(k)
+            if len(tree_edges) == node_count - 1:
+                break
+        if stats:
+            stats.phase('union')
 
-        edges.sort(key=lambda x: x[0])
+        # build the forest's CSR arrays in one pass over the accepted edges
+        degree = [0] * node_count
+        for k in tree_edges:
+            degree[sources[k]] += 1
+            degree[targets[entries[k]]] += 1
+        forest_offsets = array('q', [0])
+        for node in range(node_count):
+            forest_offsets.append(forest_offsets[-1] + degree[node])
+        fill = list(forest_offsets[:-1])
+        forest_targets = array('i', [0]) * (len(tree_edges) * 2)
+        forest_weights = array(memoryview(weights).format, [0]) * (len(tree_edges) * 2)
+        for k in tree_edges:
+            node1 = sources[k]
+            node2 = targets[entries[k]]
+            weight = weights[entries[k]]
+            forest_targets[fill[node1]] = node2
+            forest_weights[fill[node1]] = weight
+            fill[node1] += 1
+            forest_targets[fill[node2]] = node1
+            forest_weights[fill[node2]] = weight
+            fill[node2] += 1
 
-        for edge in edges:
-            weight, node1, node2 = edge
-            root1 = self.find(parent, node1)
-            root2 = self.find(parent, node2)
+        if stats:
+            stats.phase('build')
+            self.finishStats(stats, edges=len(entries), unions=unions, finds=disjoint_set.finds,
+                             find_steps=disjoint_set.findSteps, components=disjoint_set.count)
+        return CSRGraph(self.nodes, forest_offsets, forest_targets, forest_weights)
 
-            if root1 != root2:
-                result.addNode(node1.data)
-                result.addNode(node2.data)
-                result.addEdge(node1, node2, weight)
-                self.union(parent, rank, root1, root2)
+if __name__ == "__main__":
+    # Create a graph
+    g = Graph()
 
-        return result
+    # Add nodes
+    nodes = {}
+    nodes['A'] = g.addNode('A')
+    nodes['B'] = g.addNode('B')
+    nodes['C'] = g.addNode('C')
+    nodes['D'] = g.addNode('D')
+    nodes['E'] = g.addNode('E')
+
+    # Add edges
+    g.addEdge(nodes['A'], nodes['B'], 4)
+    g.addEdge(nodes['A'], nodes['C'], 2)
+    g.addEdge(nodes['A'], nodes['D'], 5)
+    g.addEdge(nodes['B'], nodes['D'], 6)
+    g.addEdge(nodes['B'], nodes['E'], 3)
+    g.addEdge(nodes['C'], nodes['D'], 1)
+    g.addEdge(nodes['D'], nodes['E'], 7)
+
+    # Find minimum spanning tree
+    mst = g.mst()
+
+    # Print the edges of the minimum spanning tree
+    for node in mst.adjacency_list:
+        print(len(mst.adjacency_list[node]))
+
+    # The frozen CSR graph gives a tree of the same total weight
+    frozen_mst = g.freeze().mst()
+    print(sum(frozen_mst.weights) / 2)
 
-# Create a graph
-g = Graph()
-
-# Add nodes
-nodes = {}
-nodes['A'] = g.addNode('A')
-nodes['B'] = g.addNode('B')
-nodes['C'] = g.addNode('C')
-nodes['D'] = g.addNode('D')
-nodes['E'] = g.addNode('E')
-
-# Add edges
-g.addEdge(nodes['A'], nodes['B'], 4)
-g.addEdge(nodes['A'], nodes['C'], 2)
-g.addEdge(nodes['A'], nodes['D'], 5)
-g.addEdge(nodes['B'], nodes['D'], 6)
-g.addEdge(nodes['B'], nodes['E'], 3)
-g.addEdge(nodes['C'], nodes['D'], 1)
-g.addEdge(nodes['D'], nodes['E'], 7)
-
-# Find minimum spanning tree
-mst = g.mst()
-
-# Print the edges of the minimum spanning tree
-for node in mst.adjacency_list:
-    print(len(mst.adjacency_list[node]))
+    # Boruvka from 1 to N workers against the serial engines on a larger random graph
+    rng = random.Random(338)
+    big = Graph()
+    big_nodes = big.addNodes(range(20000))
+    for _ in range(100000):
+        big.addEdge(rng.choice(big_nodes), rng.choice(big_nodes), rng.randint(1, 1000))
+    runs = [(algorithm, None) for algorithm in ('kruskal', 'prim')]
+    runs += [('boruvka', workers) for workers in range(1, (os.cpu_count() or 1) + 1)]
+    for algorithm, workers in runs:
+        start_time = time.perf_counter()
+        tree = big.mst(algorithm, workers)
+        elapsed = time.perf_counter() - start_time
+        weight = sum(weight for node in tree.adjacency_list for _, weight in tree.neighbors(node)) / 2
+        label = f"{algorithm}, {workers} workers" if workers else algorithm
+        print(f"{label}: {elapsed:.3f}s, weight {weight}")
@@ -1,37 +1,124 @@
+import time
 import timeit
+import tracemalloc
 import random
-import sys
+from array import array
+from collections import deque
 
-sys.setrecursionlimit(5000)
-class GraphNode:
-    def __init__(self, data):
-        self.data = data
-        
-    def equals(self, node):
-        if(node.data == self.data):
-            return True
-        return False
-class Graph2:
+from graphcore import AdjacencyGraph, CSRBase, Components, GraphNode, Instrumented, csrArrays, parseDotEdges, weightTypecode
+
+# Bit positions set in each byte value, and a table that maps every non-zero byte to 1
+BYTE_BITS = [tuple(k for k in range(8) if value >> k & 1) for value in range(256)]
+NONZERO_BYTES = bytes([0] + [1] * 255)
+
+# Set bit positions of a non-negative int in increasing order. The int is turned into bytes once
+# and bytes.find jumps over the zero bytes in C, so a sparse V-bit set costs O(V / 8) in C plus
+# O(members) in Python, instead of one V-bit int operation per member.
+def bitIds(bits):
+    data = bits.to_bytes((bits.bit_length() + 7) // 8, 'little')
+    find = data.translate(NONZERO_BYTES).find
+    result = []
+    position = find(1)
+    while position >= 0:
+        base = position * 8
+        result.extend([base + k for k in BYTE_BITS[data[position]]])
+        position = find(1, position + 1)
+    return result
+
+# The traversals shared by Graph2 and Graph, on top of their neighbors()
+class Traversals:
+    # Lazy preorder DFS: a stack of neighbor iterators replaces the recursion, so paths of any
+    # length fit and the caller can stop as soon as it has seen enough. With counters the
+    # traversal runs through countingIterDfs instead, so the plain one pays nothing for it.
+    def iterDfs(self, start_node, counters=None):
+        if counters is not None:
+            yield from self.countingIterDfs(start_node, counters)
+            return
+        visited = {start_node}
+        yield start_node
+        stack = [iter(self.neighbors(start_node))]
+        while stack:
+            for neighbor, _ in stack[-1]:
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    yield neighbor
+                    stack.append(iter(self.neighbors(neighbor)))
+                    break
+            else:
+                stack.pop()
+
+    # iterDfs that stores its visited-set probes in counters['probes'] when the traversal ends
+    # or is closed
+    def countingIterDfs(self, start_node, counters):
+        visited = {start_node}
+        probes = 0
+        try:
+            yield start_node
+            stack = [iter(self.neighbors(start_node))]
+            while stack:
+                for neighbor, _ in stack[-1]:
+                    probes += 1
+                    if neighbor not in visited:
+                        visited.add(neighbor)
+                        yield neighbor
+                        stack.append(iter(self.neighbors(neighbor)))
+                        break
+                else:
+                    stack.pop()
+        finally:
+            counters['probes'] = probes
+
+    def iterBfs(self, start_node):
+        visited = {start_node}
+        queue = deque([start_node])
+        while queue:
+            node = queue.popleft()
+            yield node
+            for neighbor, _ in self.neighbors(node):
+                if neighbor not in visited:
+                    visited.add(neighbor)
+                    queue.append(neighbor)
+
+    def dfs(self, start_node):
+        stats = self.startStats('dfs')
+        counters = {} if stats else None
+        result = list(self.iterDfs(start_node, counters))
+        if stats:
+            stats.phase('search')
+            self.finishStats(stats, visited=len(result), probes=counters['probes'])
+        return result
+
+    def bfs(self, start_node):
+        return list(self.iterBfs(start_node))
+
+class Graph2(Traversals, Instrumented, Components):
     def __init__(self):
         self.adjacency_matrix = {}
         self.nodeList = []
+        self.nodeIndex = {}
 
     def addNode(self, data):
+        # nodeIndex maps data -> node so lookup-or-create is O(1)
+        node = self.nodeIndex.get(data)
+        if node is not None:
+            return node
+
         node = GraphNode(data)
-        for nodeOb in self.nodeList:
-            if node.equals(nodeOb):
-                return nodeOb
-            
+        self.nodeIndex[data] = node
         self.nodeList.append(node)
-        if node.data not in self.adjacency_matrix:
-            self.adjacency_matrix[node] = {}
-            for existing_node in self.adjacency_matrix:
-                self.adjacency_matrix[existing_node][node] = 0
-            self.adjacency_matrix[node][node] = 0  # diagonal element
+        self.adjacency_matrix[node] = {}
+        for existing_node in self.adjacency_matrix:
+            self.adjacency_matrix[existing_node][node] = 0
+        self.adjacency_matrix[node][node] = 0  # diagonal element
+        self.trackNode(node)
         return node
 
+    def addNodes(self, data_list):
+        return [self.addNode(data) for data in data_list]
+
     def removeNode(self, node):
         if node.data in self.adjacency_matrix:
+            self.resetComponents()
             del self.adjacency_matrix[node.data]
             for key in self.adjacency_matrix:
                 del self.adjacency_matrix[key][node.data]
@@ -40,172 +127,283 @@ class Graph2:
         if n1 in self.adjacency_matrix and n2 in self.adjacency_matrix:
             self.adjacency_matrix[n1][n2] = weight
             self.adjacency_matrix[n2][n1] = weight
+            self.trackMatrixEdge(n1, n2, weight)
+
+    def addEdges(self, edges):
+        # bulk insert of (u, v, weight) tuples, creating nodes from their data as needed
+        adjacency_matrix = self.adjacency_matrix
+        addNode = self.addNode
+        for data1, data2, weight in edges:
+            n1 = addNode(data1)
+            n2 = addNode(data2)
+            adjacency_matrix[n1][n2] = weight
+            adjacency_matrix[n2][n1] = weight
+            if self.disjointSet is not None:
+                self.trackMatrixEdge(n1, n2, weight)
 
     def removeEdge(self, n1, n2):
         if n1.data in self.adjacency_matrix and n2.data in self.adjacency_matrix:
+            self.resetComponents()
             self.adjacency_matrix[n1.data][n2.data] = 0
             self.adjacency_matrix[n2.data][n1.data] = 0
 
     def importFromFile(self, file):
         self.adjacency_matrix = {}
-        nodes = []
+        self.nodeList = []
+        self.nodeIndex = {}
+        self.resetComponents()
         try:
             with open(file, 'r') as f:
-                lines = f.readlines()
-
-            # Check if the file starts with the expected format
-            if len(lines) < 2 or not lines[0].startswith("strict graph"):
-                print("Invalid GraphViz file format.")
-                return None
-
-            # Parse the lines to extract nodes and edges
-            for line in lines[1:]:
-                line = line.strip()
-                if line and line[0] != '}':
-                    if "[" in line and "]" in line:
-                        # If weight is specified
-                        parts = line.split('--')
-                        if len(parts) == 2:
-                            nodes = [n.strip() for n in parts]
-                            weight = int(line.split('weight=')[1].split(']')[0].strip())     
-                            n1 = self.addNode(int( nodes[0]))
-                            n2 = self.addNode(int((nodes[1])[0:-13]))
-                            self.addEdge(n1, n2, weight)
-                    else:
-                        # If weight is not specified (implicitly 1)
-                        parts = line.split('--')
-                        if len(parts) == 2:
-                            nodes = [n.strip() for n in parts]
-                            n1 = self.addNode(nodes[0])
-                            n2 = self.addNode(nodes[1])
-                            self.addEdge(n1, n2)
-
+                self.addEdges(parseDotEdges(f))
             print("Graph imported successfully.")
-            return nodes
+            return self.nodeList
 
         except FileNotFoundError:
             print("File not found.")
             return None
+        except ValueError:
+            print("Invalid GraphViz file format.")
+            return None
         
-    def dfs(self, start_node):
-        visited = []
-        result = []
+    # Nonzero cells of the node's row; a weight of 0 means no edge
+    def neighbors(self, node):
+        return ((neighbor, weight) for neighbor, weight in self.adjacency_matrix[node].items() if weight != 0)
 
-        def dfs_recursive(node):
-            visited.append(node)
-            result.append(node)
-            for neighbor, weight in self.adjacency_matrix[node].items():
-                for nodeOb in visited:
-                    if nodeOb.equals(node):
-                        return           
-                if weight != 0:         
-                    dfs_recursive(neighbor)
-
-        dfs_recursive(start_node)
-        return result
-    
-class Graph:
+# Dense adjacency matrix: row i of the connectivity matrix is a Python int whose bit j is set when
+# nodes i and j are joined, and the weights live in one flat array indexed by i * capacity + j.
+# capacity doubles when it runs out. Each grow allocates capacity^2 cells and copies the old rows,
+# so adding V nodes costs O(V^2) in total, amortized O(V) per node: no more than filling in the
+# node's row and column. Ids freed by removeNode are reused. A weight of 0 means no edge, as in
+# Graph2.
+class BitMatrixGraph(Instrumented, Components):
     def __init__(self):
-        self.adjacency_list = {}
-        self.nodeList = []
+        self._nodeList = None
+        self.nodeIndex = {}
+        self.ids = {}
+        self.nodes = []
+        self.freeIds = []
+        self.rows = []
+        self.capacity = 0
+        self.weights = array('i')
+
+    # nodeList follows insertion order (the order of ids) and is only rebuilt after a removal
+    @property
+    def nodeList(self):
+        if self._nodeList is None:
+            self._nodeList = list(self.ids)
+        return self._nodeList
+
+    def grow(self):
+        capacity = max(16, self.capacity * 2)
+        weights = array(self.weights.typecode, [0]) * (capacity * capacity)
+        for i in range(self.capacity):
+            weights[i * capacity:i * capacity + self.capacity] = self.weights[i * self.capacity:(i + 1) * self.capacity]
+        self.weights = weights
+        self.capacity = capacity
 
     def addNode(self, data):
-        node = GraphNode(data)
-        for nodeOb in self.nodeList:
-            if node.equals(nodeOb):
-                return nodeOb
+        # nodeIndex maps data -> node so lookup-or-create is O(1)
+        node = self.nodeIndex.get(data)
+        if node is not None:
+            return node
 
-        self.adjacency_list[node] = []
-        self.nodeList.append(node)
+        node = GraphNode(data)
+        self.nodeIndex[data] = node
+        if self._nodeList is not None:
+            self._nodeList.append(node)
+        if self.freeIds:
+            i = self.freeIds.pop()
+            self.nodes[i] = node
+        else:
+            i = len(self.nodes)
+            if i == self.capacity:
+                self.grow()
+            self.nodes.append(node)
+            self.rows.append(0)
+        self.ids[node] = i
+        self.trackNode(node)
         return node
 
+    def addNodes(self, data_list):
+        return [self.addNode(data) for data in data_list]
+
     def removeNode(self, node):
-        if node in self.adjacency_list:
-            del self.adjacency_list[node]
-            for key in self.adjacency_list:
-                self.adjacency_list[key] = [n for n in self.adjacency_list[key] if n != node]
+        i = self.ids.pop(node, None)
+        if i is None:
+            return
+        self.resetComponents()
+        # only the rows of the node's neighbors have its bit set
+        for j in self.neighborIds(i):
+            self.rows[j] &= ~(1 << i)
+            self.weights[j * self.capacity + i] = 0
+            self.weights[i * self.capacity + j] = 0
+        self.rows[i] = 0
+        self.nodes[i] = None
+        self.freeIds.append(i)
+        self._nodeList = None
+        if self.nodeIndex.get(node.data) is node:
+            del self.nodeIndex[node.data]
+
+    def setEdge(self, i, j, weight):
+        if weight == 0:
+            self.rows[i] &= ~(1 << j)
+            self.rows[j] &= ~(1 << i)
+        else:
+            if self.weights.typecode == 'i' and weightTypecode([weight]) == 'd':
+                self.weights = array('d', self.weights)
+            self.rows[i] |= 1 << j
+            self.rows[j] |= 1 << i
+        self.weights[i * self.capacity + j] = weight
+        self.weights[j * self.capacity + i] = weight
+        self.trackMatrixEdge(self.nodes[i], self.nodes[j], weight)
 
     def addEdge(self, n1, n2, weight=1):
-        if n1 in self.adjacency_list and n2 in self.adjacency_list:
-            self.adjacency_list[n1].append((n2, weight))
-            self.adjacency_list[n2].append((n1, weight))
+        if n1 in self.ids and n2 in self.ids:
+            self.setEdge(self.ids[n1], self.ids[n2], weight)
+
+    def addEdges(self, edges):
+        # bulk insert of (u, v, weight) tuples, creating nodes from their data as needed
+        ids = self.ids
+        addNode = self.addNode
+        for data1, data2, weight in edges:
+            self.setEdge(ids[addNode(data1)], ids[addNode(data2)], weight)
 
     def removeEdge(self, n1, n2):
-        if n1 in self.adjacency_list and n2 in self.adjacency_list:
-            self.adjacency_list[n1] = [(node, weight) for node, weight in self.adjacency_list[n1] if node != n2]
-            self.adjacency_list[n2] = [(node, weight) for node, weight in self.adjacency_list[n2] if node != n1]
+        if n1 in self.ids and n2 in self.ids:
+            self.setEdge(self.ids[n1], self.ids[n2], 0)
+
+    def weight(self, n1, n2):
+        return self.weights[self.ids[n1] * self.capacity + self.ids[n2]]
+
+    # Set bits of row i in increasing order
+    def neighborIds(self, i):
+        return bitIds(self.rows[i])
+
+    def neighbors(self, node):
+        i = self.ids[node]
+        base = i * self.capacity
+        return [(self.nodes[j], self.weights[base + j]) for j in self.neighborIds(i)]
 
     def importFromFile(self, file):
-        self.adjacency_list = {}
-        self.nodeList = []
+        self._nodeList = None
+        self.nodeIndex = {}
+        self.ids = {}
+        self.nodes = []
+        self.freeIds = []
+        self.rows = []
+        self.capacity = 0
+        self.weights = array('i')
+        self.resetComponents()
         try:
             with open(file, 'r') as f:
-                lines = f.readlines()
-
-            # Check if the file starts with the expected format
-            if len(lines) < 2 or not lines[0].startswith("strict graph"):
-                print("Invalid GraphViz file format.")
-                return None
-
-            # Parse the lines to extract nodes and edges
-            for line in lines[1:]:
-                line = line.strip()
-                if line and line[0] != '}':
-                    if "[" in line and "]" in line:
-                        # If weight is specified
-                        parts = line.split('--')
-                        if len(parts) == 2:
-                            nodes = [n.strip() for n in parts]
-                            weight = int(line.split('weight=')[1].split(']')[0].strip())     
-                            n1 = self.addNode(int( nodes[0]))
-                            n2 = self.addNode(int((nodes[1])[0:-13]))
-                            self.addEdge(n1, n2, weight)
-                    else:
-                        # If weight is not specified (implicitly 1)
-                        parts = line.split('--')
-                        if len(parts) == 2:
-                            nodes = [n.strip() for n in parts]
-                            n1 = self.addNode(nodes[0])
-                            n2 = self.addNode(nodes[1])
-                            self.addEdge(n1, n2)
-
+                self.addEdges(parseDotEdges(f))
             print("Graph imported successfully.")
             return self.nodeList
 
         except FileNotFoundError:
             print("File not found.")
             return None
+        except ValueError:
+            print("Invalid GraphViz file format.")
+            return None
 
-    def dfs_recursive(self, node, visited, result):
-        visited.append(node)
-        result.append(node)
-        for neighbor, _ in self.adjacency_list[node]:  # Fixed iteration over adjacency list
-            for nodeOb in visited:
-                if nodeOb.equals(node):
-                    return
-            self.dfs_recursive(neighbor, visited, result)
-
+    # Preorder DFS with an int bitset of visited ids: masking a row with ~visited leaves only the
+    # unvisited neighbors, which are pushed highest id first so they are visited in id order
     def dfs(self, start_node):
-        visited = []
+        stats = self.startStats('dfs')
+        rows = self.rows
+        nodes = self.nodes
+        visited = 0
         result = []
 
-        self.dfs_recursive(start_node, visited, result)
+        stack = [self.ids[start_node]]
+        pops = 0
+        while stack:
+            i = stack.pop()
+            pops += 1
+            if visited >> i & 1:
+                continue
+            visited |= 1 << i
+            result.append(nodes[i])
+            stack.extend(reversed(bitIds(rows[i] & ~visited)))
+
+        if stats:
+            stats.phase('search')
+            # one bit check per pop plus one row mask per visited node
+            self.finishStats(stats, pushes=pops, pops=pops, visited=len(result), probes=pops + len(result))
+        return result
+
+class Graph(Traversals, Instrumented, AdjacencyGraph):
+    # the lab's importFromFile hands back the imported node list
+    def importFromFile(self, file):
+        if super().importFromFile(file) is None:
+            return None
+        return self.nodeList
+
+    # Immutable array-backed copy for read-only workloads, ids follow adjacency_list order
+    def freeze(self):
+        return CSRGraph(*csrArrays(self))
+
+# Frozen graph for the traversals
+class CSRGraph(CSRBase):
+    # Preorder DFS with a bytearray visited map, returns node ids. The stack holds one cursor
+    # per open node, an iterator over its slice of targets, so every edge is scanned once and
+    # nothing is pushed twice; neighbors are visited in adjacency order.
+    def dfs(self, start_id):
+        stats = self.startStats('dfs')
+        offsets = self.offsets
+        targets = memoryview(self.targets)
+        visited = bytearray(len(self.nodes))
+        visited[start_id] = 1
+        result = [start_id]
+
+        stack = [iter(targets[offsets[start_id]:offsets[start_id + 1]])]
+        while stack:
+            for target in stack[-1]:
+                if not visited[target]:
+                    visited[target] = 1
+                    result.append(target)
+                    stack.append(iter(targets[offsets[target]:offsets[target + 1]]))
+                    break
+            else:
+                stack.pop()
+
+        if stats:
+            stats.phase('search')
+            # one cursor per visited node, run to the end of its slice with one probe per edge
+            scanned = sum(offsets[node + 1] - offsets[node] for node in result)
+            self.finishStats(stats, pushes=len(result), pops=len(result), visited=len(result), probes=scanned)
         return result
-    
+
 def measureTimes(graph):
     graph.importFromFile("random.dot")
     print(len(graph.nodeList))
-    times = timeit.repeat(lambda: graph.dfs(graph.nodeList[0]), repeat=10)
+    times = timeit.repeat(lambda: graph.dfs(graph.nodeList[0]), number=10, repeat=10)
 
     return times
 
-graph = Graph()
-graphOneTimes = measureTimes(graph)
+if __name__ == "__main__":
+    graph = Graph()
+    graphOneTimes = measureTimes(graph)
+
+    print("Graph one times - Max:", max(graphOneTimes), "Min:", min(graphOneTimes), "Avg:", sum(graphOneTimes)/len(graphOneTimes))
 
-print("Graph one times - Max:", max(graphOneTimes), "Min:", min(graphOneTimes), "Avg:", sum(graphOneTimes)/len(graphOneTimes))
+    graph = Graph2()
+    graphTwoTimes = measureTimes(graph)
 
-graph = Graph2()
-graphTwoTimes = measureTimes(graph)
 
+    print("Graph one times - Max:", max(graphTwoTimes), "Min:", min(graphTwoTimes), "Avg:", sum(graphTwoTimes)/len(graphTwoTimes))
 
-print("Graph one times - Max:", max(graphTwoTimes), "Min:", min(graphTwoTimes), "Avg:", sum(graphTwoTimes)/len(graphTwoTimes))
\ No newline at end of file
+    # Dict-of-dicts Graph2 against the bit-matrix backend on random.dot: memory held by the
+    # imported graph, import time and DFS time
+    for graph in (Graph2(), BitMatrixGraph()):
+        tracemalloc.start()
+        start_time = time.perf_counter()
+        graph.importFromFile("random.dot")
+        import_time = time.perf_counter() - start_time
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        times = timeit.repeat(lambda: graph.dfs(graph.nodeList[0]), number=10, repeat=5)
+        visited = len(graph.dfs(graph.nodeList[0]))
+        print(f"{type(graph).__name__}: {memory / 1e6:.2f} MB, import {import_time:.3f}s, "
+              f"dfs {min(times) / 10 * 1e3:.3f}ms ({visited} visited)")
@@ -14,6 +14,15 @@
 # meaning that all of its edges have been investigated. The stack has a legitimate topological
 # ordering from the bottom to the top once every vertex has been visited.
 
+import random
+import time
+from array import array
+from bisect import bisect_right
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, ThreadPoolExecutor, wait
+
+from graphcore import CSRBase, csrArrays
+
 class GraphNode:
     def __init__(self, data):
         self.data = data
@@ -23,103 +32,729 @@ class GraphNode:
         return f'{self.data}'
 
 class Graph:
-    def __init__(self):
+    def __init__(self, keyed=False):
+        # keyed mode keeps each node's out-neighbors in a {neighbour: weight} dict plus a reverse
+        # {predecessor: weight} index, so removals are O(degree); dicts keep insertion order
+        self.keyed = keyed
         self.adjacency_list = {}
+        self.reverse_list = {}
+
+    def neighbors(self, node):
+        if self.keyed:
+            return self.adjacency_list[node].items()
+        return self.adjacency_list[node]
 
     def addNode(self, data):
         node = GraphNode(data)
-        self.adjacency_list[node] = []
+        if self.keyed:
+            self.adjacency_list[node] = {}
+            self.reverse_list[node] = {}
+        else:
+            self.adjacency_list[node] = []
         return node
 
     def removeNode(self, node):
         if node in self.adjacency_list:
-            del self.adjacency_list[node]
-            for key in self.adjacency_list:
-                self.adjacency_list[key] = [n for n in self.adjacency_list[key] if n != node]
+            for neighbour, _ in self.neighbors(node):
+                neighbour.indegree -= 1
+            if self.keyed:
+                for neighbour in self.adjacency_list[node]:
+                    del self.reverse_list[neighbour][node]
+                for predecessor in self.reverse_list[node]:
+                    del self.adjacency_list[predecessor][node]
+                del self.reverse_list[node]
+                del self.adjacency_list[node]
+            else:
+                del self.adjacency_list[node]
+                for key in self.adjacency_list:
+                    self.adjacency_list[key] = [(n, weight) for n, weight in self.adjacency_list[key] if n != node]
 
     def addEdge(self, n1, n2, weight=1):
         if n1 in self.adjacency_list and n2 in self.adjacency_list:
-            self.adjacency_list[n1].append((n2, weight))
-            n2.indegree += 1
+            if self.keyed:
+                if n2 not in self.adjacency_list[n1]:
+                    n2.indegree += 1
+                self.adjacency_list[n1][n2] = weight
+                self.reverse_list[n2][n1] = weight
+            else:
+                self.adjacency_list[n1].append((n2, weight))
+                n2.indegree += 1
 
     def removeEdge(self, n1, n2):
         if n1 in self.adjacency_list and n2 in self.adjacency_list:
-            self.adjacency_list[n1] = [(node, weight) for node, weight in self.adjacency_list[n1] if node != n2]
-            if (n2, weight) in self.adjacency_list[n1]:
-                n2.indegree -= 1
+            if self.keyed:
+                if n2 in self.adjacency_list[n1]:
+                    del self.adjacency_list[n1][n2]
+                    del self.reverse_list[n2][n1]
+                    n2.indegree -= 1
+            else:
+                edges = self.adjacency_list[n1]
+                self.adjacency_list[n1] = [(node, weight) for node, weight in edges if node != n2]
+                n2.indegree -= len(edges) - len(self.adjacency_list[n1])
+
+    # Immutable array-backed copy for read-only workloads, ids follow adjacency_list order
+    # and only out-edges are stored
+    def freeze(self):
+        return CSRGraph(*csrArrays(self))
 
     def isdag(self):
-        def _dfs(node, visited, recStack):
-            visited[node] = True
-            recStack[node] = True
-            for neighbour, _ in self.adjacency_list[node]:
-                if not visited[neighbour]:
-                    if _dfs(neighbour, visited, recStack):
-                        return True
-                elif recStack[neighbour]:
-                    return True
-            recStack[node] = False
-            return False
+        return self.toposortOrCycle()[1] is None
+
+    def toposort(self):
+        return self.toposortOrCycle()[0]
+
+    # One pass of Kahn's algorithm over a local indegree map, so the GraphNode counters are
+    # left alone and concurrent calls cannot interfere. Returns (order, None) for a DAG and
+    # (None, cycle) otherwise, the cycle listed in edge order.
+    def toposortOrCycle(self):
+        indegree = dict.fromkeys(self.adjacency_list, 0)
+        for node in self.adjacency_list:
+            for neighbour, _ in self.neighbors(node):
+                indegree[neighbour] += 1
+
+        topo_order = []
+        zero_indegree_queue = deque(node for node, degree in indegree.items() if degree == 0)
+        while zero_indegree_queue:
+            node = zero_indegree_queue.popleft()
+            topo_order.append(node)
+            for neighbour, _ in self.neighbors(node):
+                indegree[neighbour] -= 1
+                if indegree[neighbour] == 0:
+                    zero_indegree_queue.append(neighbour)
+
+        if len(topo_order) == len(self.adjacency_list):
+            return topo_order, None
+        return None, self.leftoverCycle(indegree)
+
+    # Kahn's algorithm one wave at a time: each level is an antichain of nodes whose
+    # predecessors all sit in earlier levels. Returns None if there is a cycle.
+    def levels(self):
+        indegree = dict.fromkeys(self.adjacency_list, 0)
+        for node in self.adjacency_list:
+            for neighbour, _ in self.neighbors(node):
+                indegree[neighbour] += 1
+
+        levels = []
+        level = [node for node, degree in indegree.items() if degree == 0]
+        while level:
+            levels.append(level)
+            next_level = []
+            for node in level:
+                for neighbour, _ in self.neighbors(node):
+                    indegree[neighbour] -= 1
+                    if indegree[neighbour] == 0:
+                        next_level.append(neighbour)
+            level = next_level
+
+        if sum(len(level) for level in levels) != len(self.adjacency_list):
+            return None
+        return levels
+
+    # Tarjan's algorithm with an explicit stack of (node, neighbour iterator) frames instead of
+    # recursion. Returns the strongly connected components as lists of nodes, in topological
+    # order of the condensation (Tarjan finds sink components first, so the list is reversed).
+    def stronglyConnectedComponents(self):
+        index = {}
+        lowlink = {}
+        on_stack = set()
+        stack = []
+        components = []
+        for root in self.adjacency_list:
+            if root in index:
+                continue
+            index[root] = lowlink[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            frames = [(root, iter(self.neighbors(root)))]
+            while frames:
+                node, neighbours = frames[-1]
+                for neighbour, _ in neighbours:
+                    if neighbour not in index:
+                        index[neighbour] = lowlink[neighbour] = len(index)
+                        stack.append(neighbour)
+                        on_stack.add(neighbour)
+                        frames.append((neighbour, iter(self.neighbors(neighbour))))
+                        break
+                    if neighbour in on_stack and index[neighbour] < lowlink[node]:
+                        lowlink[node] = index[neighbour]
+                else:
+                    frames.pop()
+                    if frames and lowlink[node] < lowlink[frames[-1][0]]:
+                        lowlink[frames[-1][0]] = lowlink[node]
+                    if lowlink[node] == index[node]:
+                        component = []
+                        while True:
+                            member = stack.pop()
+                            on_stack.discard(member)
+                            component.append(member)
+                            if member is node:
+                                break
+                        components.append(component)
 
-        visited = {node: False for node in self.adjacency_list}
-        recStack = {node: False for node in self.adjacency_list}
+        components.reverse()
+        return components
+
+    # Component DAG: one node per strongly connected component, whose data is the tuple of its
+    # members, and one edge per connected pair of components carrying the lightest original edge.
+    # Returns (dag, component_of) where component_of maps every node to its component node.
+    def condense(self):
+        dag = Graph(self.keyed)
+        component_of = {}
+        for members in self.stronglyConnectedComponents():
+            component = dag.addNode(tuple(members))
+            for member in members:
+                component_of[member] = component
+
+        weights = {}
         for node in self.adjacency_list:
-            if not visited[node]:
-                if _dfs(node, visited, recStack):
-                    return False
+            for neighbour, weight in self.neighbors(node):
+                pair = (component_of[node], component_of[neighbour])
+                if pair[0] is not pair[1] and (pair not in weights or weight < weights[pair]):
+                    weights[pair] = weight
+        for (component1, component2), weight in weights.items():
+            dag.addEdge(component1, component2, weight)
+        return dag, component_of
+
+    # Every node Kahn could not emit still has a predecessor that was not emitted either, so
+    # walking those predecessors back from any leftover node must close a cycle
+    def leftoverCycle(self, indegree):
+        predecessor = {}
+        for node, degree in indegree.items():
+            if degree > 0:
+                for neighbour, _ in self.neighbors(node):
+                    if indegree[neighbour] > 0:
+                        predecessor[neighbour] = node
+
+        node = next(node for node, degree in indegree.items() if degree > 0)
+        seen = set()
+        while node not in seen:
+            seen.add(node)
+            node = predecessor[node]
+        cycle = [node]
+        while predecessor[cycle[-1]] is not node:
+            cycle.append(predecessor[cycle[-1]])
+        cycle.reverse()
+        return cycle
+
+# Topological order kept up to date under edge insertions (Pearce-Kelly). order[i] is the node at
+# position i and position maps it back. An edge that already points forward in the order is
+# free; otherwise only the nodes between the two positions are searched: forward from the head
+# and backward from the tail. Reaching the tail means the edge closes a cycle and it is rejected,
+# else the two affected sets are reassigned the same positions, backward set first. All edges
+# must go through this object once it wraps the graph.
+class OnlineTopoOrder:
+    def __init__(self, graph):
+        self.graph = graph
+        order, cycle = graph.toposortOrCycle()
+        if cycle is not None:
+            raise ValueError(f"graph has a cycle: {cycle}")
+        self.order = order
+        self.position = {node: i for i, node in enumerate(order)}
+        self.predecessors = {node: {} for node in graph.adjacency_list}
+        for node in graph.adjacency_list:
+            for neighbour, _ in graph.neighbors(node):
+                self.predecessors[neighbour][node] = None
+        # nodes visited by reorders since construction
+        self.touched = 0
+
+    def addNode(self, data):
+        node = self.graph.addNode(data)
+        self.position[node] = len(self.order)
+        self.order.append(node)
+        self.predecessors[node] = {}
+        return node
+
+    # Adds the edge and returns True, or returns False and leaves the graph unchanged if it
+    # would create a cycle
+    def addEdge(self, n1, n2, weight=1):
+        position = self.position
+        lower = position[n2]
+        upper = position[n1]
+        if lower < upper:
+            forward = self.searchForward(n2, n1, upper)
+            if forward is None:
+                return False
+            self.reorder(self.searchBackward(n1, lower), forward)
+        elif n1 is n2:
+            return False
+
+        self.graph.addEdge(n1, n2, weight)
+        self.predecessors[n2][n1] = None
         return True
 
+    def removeEdge(self, n1, n2):
+        # removing an edge never invalidates the order
+        self.graph.removeEdge(n1, n2)
+        self.predecessors[n2].pop(n1, None)
+
+    # Nodes reachable from start without leaving positions <= upper, or None once the search
+    # reaches stop
+    def searchForward(self, start, stop, upper):
+        graph = self.graph
+        position = self.position
+        visited = {start}
+        stack = [start]
+        while stack:
+            for neighbour, _ in graph.neighbors(stack.pop()):
+                if neighbour is stop:
+                    self.touched += len(visited)
+                    return None
+                if neighbour not in visited and position[neighbour] <= upper:
+                    visited.add(neighbour)
+                    stack.append(neighbour)
+        self.touched += len(visited)
+        return visited
+
+    # Nodes that reach start without leaving positions >= lower
+    def searchBackward(self, start, lower):
+        predecessors = self.predecessors
+        position = self.position
+        visited = {start}
+        stack = [start]
+        while stack:
+            for predecessor in predecessors[stack.pop()]:
+                if predecessor not in visited and position[predecessor] >= lower:
+                    visited.add(predecessor)
+                    stack.append(predecessor)
+        self.touched += len(visited)
+        return visited
+
+    # The affected nodes keep the same pool of positions; the backward set (which must now
+    # precede the forward set) takes the lowest ones, each set keeping its relative order
+    def reorder(self, backward, forward):
+        position = self.position
+        backward = sorted(backward, key=position.__getitem__)
+        forward = sorted(forward, key=position.__getitem__)
+        slots = sorted(position[node] for node in backward + forward)
+        for slot, node in zip(slots, backward + forward):
+            position[node] = slot
+            self.order[slot] = node
+
+# Runs in the pool so start and end are taken around the task itself
+def timedCall(task, data):
+    start_time = time.perf_counter()
+    result = task(data)
+    return start_time, time.perf_counter(), result
+
+# Runs task(node.data) for every node of a DAG on a thread or process pool, a node being
+# submitted as soon as all its predecessors have finished rather than level by level. At most
+# workers tasks are in flight. A failed task skips all of its descendants while independent
+# branches keep running. run returns a report with per-node results, errors and timings, and
+# the critical path: the chain of dependent tasks with the largest total duration, which bounds
+# the wall time however many workers there are.
+class DagExecutor:
+    def __init__(self, graph, workers=4, processes=False):
+        self.graph = graph
+        self.workers = workers
+        # process pools need a picklable task and picklable node data
+        self.processes = processes
+
+    def run(self, task):
+        graph = self.graph
+        order, cycle = graph.toposortOrCycle()
+        if cycle is not None:
+            raise ValueError(f"graph has a cycle: {cycle}")
+        indegree = dict.fromkeys(graph.adjacency_list, 0)
+        for node in order:
+            for neighbour, _ in graph.neighbors(node):
+                indegree[neighbour] += 1
+
+        results = {}
+        errors = {}
+        skipped = set()
+        timings = {}
+        ready = deque(node for node in order if indegree[node] == 0)
+        running = {}
+        peak_concurrency = 0
+        pool_class = ProcessPoolExecutor if self.processes else ThreadPoolExecutor
+        start_time = time.perf_counter()
+        with pool_class(self.workers) as pool:
+            while ready or running:
+                while ready and len(running) < self.workers:
+                    node = ready.popleft()
+                    running[pool.submit(timedCall, task, node.data)] = node
+                peak_concurrency = max(peak_concurrency, len(running))
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    node = running.pop(future)
+                    try:
+                        task_start, task_end, results[node] = future.result()
+                    except Exception as error:
+                        errors[node] = error
+                        self.skipDescendants(node, skipped)
+                        continue
+                    timings[node] = (task_start - start_time, task_end - start_time)
+                    for neighbour, _ in graph.neighbors(node):
+                        indegree[neighbour] -= 1
+                        if indegree[neighbour] == 0 and neighbour not in skipped:
+                            ready.append(neighbour)
+        wall_time = time.perf_counter() - start_time
+
+        # longest chain of finished tasks by total duration, in topological order
+        finish = {}
+        previous = {}
+        for node in order:
+            if node not in timings:
+                continue
+            start, end = timings[node]
+            finish[node] = finish.get(node, 0) + end - start
+            for neighbour, _ in graph.neighbors(node):
+                if neighbour in timings and finish[node] > finish.get(neighbour, 0):
+                    finish[neighbour] = finish[node]
+                    previous[neighbour] = node
+        critical_path = []
+        if finish:
+            node = max(finish, key=finish.get)
+            while node is not None:
+                critical_path.append(node)
+                node = previous.get(node)
+            critical_path.reverse()
+
+        work_time = sum(end - start for start, end in timings.values())
+        return {
+            'results': results,
+            'errors': errors,
+            'skipped': skipped,
+            'timings': timings,
+            'wall_time': wall_time,
+            'work_time': work_time,
+            'parallelism': work_time / wall_time if wall_time else 0,
+            'peak_concurrency': peak_concurrency,
+            'critical_path': critical_path,
+            'critical_path_time': max(finish.values(), default=0),
+        }
+
+    def skipDescendants(self, node, skipped):
+        stack = [node]
+        while stack:
+            for neighbour, _ in self.graph.neighbors(stack.pop()):
+                if neighbour not in skipped:
+                    skipped.add(neighbour)
+                    stack.append(neighbour)
+
+# Merges (start, end) id intervals into sorted, disjoint starts/ends arrays and leaves out the
+# node's own interval [low, high]. Returns None when nothing is left.
+def mergeIntervals(pieces, low, high):
+    pieces.append((low, high))
+    pieces.sort()
+    merged = []
+    for start, end in pieces:
+        if merged and start <= merged[-1][1] + 1:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+
+    starts = array('i')
+    ends = array('i')
+    for start, end in merged:
+        if start <= low and high <= end:
+            if start < low:
+                starts.append(start)
+                ends.append(low - 1)
+            if high < end:
+                starts.append(high + 1)
+                ends.append(end)
+        else:
+            starts.append(start)
+            ends.append(end)
+    return (starts, ends) if starts else None
+
+# Transitive reachability index for a DAG by interval labelling. A DFS gives the nodes postorder
+# ids and a spanning forest; a node's subtree in that forest is the id range [low[i], i], so the
+# tree part of its reach is a single interval. Only what a node reaches through non-tree edges is
+# stored on top of it, as a sorted list of extra id intervals. A forest therefore costs two ints
+# per node, and each non-tree edge adds intervals only to the nodes above it.
+class ReachabilityIndex:
+    def __init__(self, graph):
+        self.graph = graph
+        if graph.toposortOrCycle()[1] is not None:
+            raise ValueError("graph has a cycle")
+
+        self.ids = {}
+        self.nodes = []
+        self.low = array('i')
+        for root in graph.adjacency_list:
+            if root in self.ids:
+                continue
+            # in a DAG a neighbour is either finished or not yet visited; the id count when a
+            # node is entered is the lowest id of its subtree
+            frames = [(root, iter(graph.neighbors(root)), len(self.nodes))]
+            while frames:
+                node, neighbours, low = frames[-1]
+                for neighbour, _ in neighbours:
+                    if neighbour not in self.ids:
+                        frames.append((neighbour, iter(graph.neighbors(neighbour)), len(self.nodes)))
+                        break
+                else:
+                    frames.pop()
+                    self.ids[node] = len(self.nodes)
+                    self.nodes.append(node)
+                    self.low.append(low)
+
+        # parents[j] lists the ids with an edge into j, addEdge walks them backwards
+        self.parents = [[] for _ in self.nodes]
+        # id -> (starts, ends) of the intervals reached through non-tree edges; ids are a reverse
+        # topological order, so every child is final before its parents
+        self.extra = {}
+        for i, node in enumerate(self.nodes):
+            low = self.low[i]
+            pieces = []
+            for neighbour, _ in graph.neighbors(node):
+                child = self.ids[neighbour]
+                self.parents[child].append(i)
+                if not low <= child <= i:
+                    pieces.append((self.low[child], child))
+                extra = self.extra.get(child)
+                if extra is not None:
+                    pieces.extend(zip(*extra))
+            if pieces:
+                extra = mergeIntervals(pieces, low, i)
+                if extra is not None:
+                    self.extra[i] = extra
+
+    # Bytes held by the interval labels
+    def memory(self):
+        return self.low.itemsize * len(self.low) + sum(
+            starts.itemsize * len(starts) * 2 for starts, _ in self.extra.values())
+
+    def reaches(self, n1, n2):
+        i = self.ids[n1]
+        j = self.ids[n2]
+        if self.low[i] <= j <= i:
+            return True
+        extra = self.extra.get(i)
+        if extra is None:
+            return False
+        starts, ends = extra
+        k = bisect_right(starts, j) - 1
+        return k >= 0 and ends[k] >= j
+
+    # The node itself and everything it reaches, in id order per interval
+    def descendants(self, node):
+        i = self.ids[node]
+        result = self.nodes[self.low[i]:i + 1]
+        extra = self.extra.get(i)
+        if extra is not None:
+            for start, end in zip(*extra):
+                result.extend(self.nodes[start:end + 1])
+        return result
+
+    # Walks the edges backwards from the node, so the cost is the size of the answer
+    def ancestors(self, node):
+        j = self.ids[node]
+        seen = {j}
+        stack = [j]
+        while stack:
+            for parent in self.parents[stack.pop()]:
+                if parent not in seen:
+                    seen.add(parent)
+                    stack.append(parent)
+        return [self.nodes[i] for i in sorted(seen)]
+
+    def addNode(self, data):
+        node = self.graph.addNode(data)
+        self.ids[node] = len(self.nodes)
+        self.nodes.append(node)
+        self.low.append(len(self.nodes) - 1)
+        self.parents.append([])
+        return node
+
+    # Adds the edge and returns True, or returns False and leaves the graph unchanged if it
+    # would create a cycle. The new reach is pushed backwards from n1 along the parents; the walk
+    # stops at nodes that already reached n2, because their ancestors do as well.
+    def addEdge(self, n1, n2, weight=1):
+        if n1 is n2 or self.reaches(n2, n1):
+            return False
+        self.graph.addEdge(n1, n2, weight)
+        i = self.ids[n1]
+        j = self.ids[n2]
+        self.parents[j].append(i)
+        if self.reaches(n1, n2):
+            return True
+
+        added = [(self.low[j], j)]
+        extra = self.extra.get(j)
+        if extra is not None:
+            added.extend(zip(*extra))
+        seen = {i}
+        stack = [i]
+        while stack:
+            k = stack.pop()
+            pieces = list(added)
+            extra = self.extra.get(k)
+            if extra is not None:
+                pieces.extend(zip(*extra))
+            extra = mergeIntervals(pieces, self.low[k], k)
+            if extra is not None:
+                self.extra[k] = extra
+            for parent in self.parents[k]:
+                if parent not in seen and not self.reaches(self.nodes[parent], n2):
+                    seen.add(parent)
+                    stack.append(parent)
+        return True
+
+# Frozen DAG, only the out-neighbors of node i are in targets[offsets[i]:offsets[i + 1]]
+class CSRGraph(CSRBase):
+    # Kahn's algorithm over a local indegree array, returns node ids or None if there is a cycle
     def toposort(self):
-        if not self.isdag():
-            return None
+        offsets = self.offsets
+        targets = self.targets
+        indegree = [0] * len(self.nodes)
+        for target in targets:
+            indegree[target] += 1
 
         topo_order = []
-        zero_indegree_queue = [node for node in self.adjacency_list if node.indegree == 0]
-
+        zero_indegree_queue = deque(node for node in range(len(self.nodes)) if indegree[node] == 0)
         while zero_indegree_queue:
-            node = zero_indegree_queue.pop(0)
+            node = zero_indegree_queue.popleft()
             topo_order.append(node)
+            for i in range(offsets[node], offsets[node + 1]):
+                indegree[targets[i]] -= 1
+                if indegree[targets[i]] == 0:
+                    zero_indegree_queue.append(targets[i])
 
-            for neighbour, _ in self.adjacency_list[node]:
-                neighbour.indegree -= 1
-                if neighbour.indegree == 0:
-                    zero_indegree_queue.append(neighbour)
-
-        if len(topo_order) == len(self.adjacency_list):
+        if len(topo_order) == len(self.nodes):
             return topo_order
-        else:
-            return None
+        return None
+
+# Streams num_edges random insertions into an empty graph through OnlineTopoOrder and returns
+# (online seconds, estimated seconds for a full toposortOrCycle after every insert, accepted edges).
+# Full recomputation is only timed on every sample_every-th insert and scaled up.
+def measureOnlineInserts(num_nodes, num_edges, sample_every=1000, seed=338):
+    rng = random.Random(seed)
+    graph = Graph()
+    nodes = [graph.addNode(i) for i in range(num_nodes)]
+    online = OnlineTopoOrder(graph)
+
+    online_time = full_time = 0
+    accepted = 0
+    for i in range(num_edges):
+        n1 = rng.choice(nodes)
+        n2 = rng.choice(nodes)
+        start_time = time.perf_counter()
+        accepted += online.addEdge(n1, n2)
+        online_time += time.perf_counter() - start_time
+        if i % sample_every == 0:
+            start_time = time.perf_counter()
+            graph.toposortOrCycle()
+            full_time += (time.perf_counter() - start_time) * sample_every
+
+    return online_time, full_time, accepted
+
+# Times stronglyConnectedComponents and condense on a random graph, returns
+# (components, largest component, scc seconds, condense seconds)
+def measureSccTimes(num_nodes, num_edges, seed=338):
+    rng = random.Random(seed)
+    graph = Graph()
+    nodes = [graph.addNode(i) for i in range(num_nodes)]
+    for _ in range(num_edges):
+        graph.addEdge(rng.choice(nodes), rng.choice(nodes))
+
+    start_time = time.perf_counter()
+    components = graph.stronglyConnectedComponents()
+    scc_time = time.perf_counter() - start_time
+    start_time = time.perf_counter()
+    graph.condense()
+    condense_time = time.perf_counter() - start_time
+    return len(components), max(len(component) for component in components), scc_time, condense_time
+
+# Builds a ReachabilityIndex on a random dependency DAG (a random recursive tree plus an extra
+# edge into a node with probability extra) and times 100k reaches() queries. Returns
+# (build seconds, index bytes, seconds per query).
+def measureReachability(num_nodes, extra=0.05, seed=338):
+    rng = random.Random(seed)
+    graph = Graph()
+    nodes = [graph.addNode(i) for i in range(num_nodes)]
+    for i in range(1, num_nodes):
+        graph.addEdge(nodes[rng.randrange(i)], nodes[i])
+        if rng.random() < extra:
+            graph.addEdge(nodes[rng.randrange(i)], nodes[i])
+
+    start_time = time.perf_counter()
+    index = ReachabilityIndex(graph)
+    build_time = time.perf_counter() - start_time
+    pairs = [(rng.choice(nodes), rng.choice(nodes)) for _ in range(100000)]
+    start_time = time.perf_counter()
+    for n1, n2 in pairs:
+        index.reaches(n1, n2)
+    query_time = (time.perf_counter() - start_time) / len(pairs)
+    return build_time, index.memory(), query_time
+
+if __name__ == "__main__":
+    # Scenario 1: Graph with a cycle
+    graph_with_cycle = Graph()
+    node_1 = graph_with_cycle.addNode('1')
+    node_2 = graph_with_cycle.addNode('2')
+    node_3 = graph_with_cycle.addNode('3')
+    graph_with_cycle.addEdge(node_1, node_2)
+    graph_with_cycle.addEdge(node_2, node_3)
+    graph_with_cycle.addEdge(node_3, node_1)
+
+    # Scenario 2: Graph without a cycle
+    graph_without_cycle = Graph()
+    node_a = graph_without_cycle.addNode('A')
+    node_b = graph_without_cycle.addNode('B')
+    node_c = graph_without_cycle.addNode('C')
+    node_d = graph_without_cycle.addNode('D')
+    graph_without_cycle.addEdge(node_a, node_b)
+    graph_without_cycle.addEdge(node_a, node_c)
+    graph_without_cycle.addEdge(node_b, node_d)
+    graph_without_cycle.addEdge(node_c, node_d)
+
+    # Testing isdag on both graphs
+    isdag_with_cycle_result = graph_with_cycle.isdag()
+    isdag_without_cycle_result = graph_without_cycle.isdag()
+
+    # Testing topsort on both graphs
+    topsort_with_cycle_result = graph_with_cycle.toposort()
+    topsort_without_cycle_result = graph_without_cycle.toposort()
+
+    print(f'Graph with cycle is a DAG: {isdag_with_cycle_result}')
+    print(f'Topological Sort (Graph with cycle): {topsort_with_cycle_result}')
+    print(f'Cycle found: {graph_with_cycle.toposortOrCycle()[1]}')
+
+    print(f'Graph without cycle is a DAG: {isdag_without_cycle_result}')
+    print(f'Topological Sort (Graph without cycle): {topsort_without_cycle_result}')
+
+    # The frozen CSR graphs sort without touching the GraphNode indegree counters
+    print(f'CSR Topological Sort (Graph with cycle): {graph_with_cycle.freeze().toposort()}')
+    frozen_without_cycle = graph_without_cycle.freeze()
+    print(f'CSR Topological Sort (Graph without cycle): {[frozen_without_cycle.nodes[i] for i in frozen_without_cycle.toposort()]}')
+
+    # 100k random edge insertions with a valid order after each one
+    online_time, full_time, accepted = measureOnlineInserts(10000, 100000)
+    print(f'Online order: {accepted} of 100000 edges accepted in {online_time:.2f}s, '
+          f'full recomputation after every insert: ~{full_time:.0f}s')
+
+    # A random 60-job build DAG on 1, 4 and 8 threads: each job sleeps 10-50ms
+    rng = random.Random(338)
+    jobs = Graph()
+    job_nodes = [jobs.addNode(i) for i in range(60)]
+    for i in range(1, 60):
+        for j in rng.sample(range(i), min(i, 2)):
+            jobs.addEdge(job_nodes[j], job_nodes[i])
+    durations = [rng.uniform(0.01, 0.05) for _ in range(60)]
+    print(f'Job DAG: {len(jobs.levels())} levels, widest {max(len(level) for level in jobs.levels())}')
+    for workers in (1, 4, 8):
+        report = DagExecutor(jobs, workers).run(lambda job: time.sleep(durations[job]))
+        print(f"{workers} workers: wall {report['wall_time']:.3f}s, work {report['work_time']:.3f}s, "
+              f"parallelism {report['parallelism']:.2f}, critical path {report['critical_path_time']:.3f}s "
+              f"over {len(report['critical_path'])} jobs")
+
+    # The cyclic graph still sorts at the component level
+    condensed, component_of = graph_with_cycle.condense()
+    print(f'Condensed Topological Sort (Graph with cycle): {condensed.toposort()}')
+
+    # Tarjan and condensation on million-edge graphs: sparse, and dense enough for a giant component
+    for num_nodes in (1000000, 200000):
+        count, largest, scc_time, condense_time = measureSccTimes(num_nodes, 1000000)
+        print(f'{num_nodes} nodes, 1000000 edges: {count} components (largest {largest}), '
+              f'scc {scc_time:.2f}s, condense {condense_time:.2f}s')
 
-# Scenario 1: Graph with a cycle
-graph_with_cycle = Graph()
-node_1 = graph_with_cycle.addNode('1')
-node_2 = graph_with_cycle.addNode('2')
-node_3 = graph_with_cycle.addNode('3')
-graph_with_cycle.addEdge(node_1, node_2)
-graph_with_cycle.addEdge(node_2, node_3)
-graph_with_cycle.addEdge(node_3, node_1)
-
-# Scenario 2: Graph without a cycle
-graph_without_cycle = Graph()
-node_a = graph_without_cycle.addNode('A')
-node_b = graph_without_cycle.addNode('B')
-node_c = graph_without_cycle.addNode('C')
-node_d = graph_without_cycle.addNode('D')
-graph_without_cycle.addEdge(node_a, node_b)
-graph_without_cycle.addEdge(node_a, node_c)
-graph_without_cycle.addEdge(node_b, node_d)
-graph_without_cycle.addEdge(node_c, node_d)
-
-# Testing isdag on both graphs
-isdag_with_cycle_result = graph_with_cycle.isdag()
-isdag_without_cycle_result = graph_without_cycle.isdag()
-
-# Testing topsort on both graphs
-topsort_with_cycle_result = graph_with_cycle.toposort()
-topsort_without_cycle_result = graph_without_cycle.toposort()
-
-print(f'Graph with cycle is a DAG: {isdag_with_cycle_result}')
-print(f'Topological Sort (Graph with cycle): {topsort_with_cycle_result}')
-
-print(f'Graph without cycle is a DAG: {isdag_without_cycle_result}')
-print(f'Topological Sort (Graph without cycle): {topsort_without_cycle_result}')
\ No newline at end of file
+    # Reachability index build time and memory against a full V x V bit matrix
+    for num_nodes in (10000, 50000, 200000):
+        build_time, memory, query_time = measureReachability(num_nodes)
+        print(f'Reachability index, {num_nodes} nodes: build {build_time:.2f}s, {memory / 1e6:.1f} MB '
+              f'(full matrix {num_nodes * num_nodes / 8e6:.0f} MB), {query_time * 1e9:.0f}ns per query')
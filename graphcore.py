@@ -0,0 +1,477 @@
+# Code shared by the lab graphs in ex1-ex5: the DOT reader, weight typecodes, the opt-in
+# instrumentation, the union-find behind the component queries, the adjacency-list graph and the
+# frozen CSR base class
+import re
+import time
+import tracemalloc
+from array import array
+
+# Smallest array typecode that holds every weight exactly
+def weightTypecode(weights):
+    if all(type(weight) is int and -2**31 <= weight < 2**31 for weight in weights):
+        return 'i'
+    return 'd'
+
+# Streaming parser for the "strict graph" DOT files. The file is read in chunks and split into
+# tokens, quoted strings and comments each being a single token, so whatever they contain cannot
+# be mistaken for an edge or an attribute. A small state machine over the tokens then yields one
+# (data1, data2, weight) tuple per "--" of every edge statement. Plain "a -- b [weight=w];"
+# statements, which is all the lab files contain, are matched whole by the first alternative of
+# the pattern instead of token by token.
+DOT_HEADER = re.compile(r'\s*strict\s+graph\b[^{]*\{')
+DOT_ID = r'"(?:[^"\\]|\\.)*"|-?(?:\.\d+|\d+(?:\.\d*)?)|[^\W\d]\w*'
+# an unterminated string or block comment runs to the end of the chunk and is read again with
+# the next one
+DOT_TOKEN = r'[\w.]+|--|[\[\]=;,:{}]|->|-[\w.]*|"(?:[^"\\]|\\.)*(?:"|\\?\Z)|/\*.*?(?:\*/|\Z)|(?://|#)[^\n]*|\S'
+DOT_STATEMENT = re.compile(r'\s*(?:(' + DOT_ID + r')\s*--\s*(' + DOT_ID + r')\s*'
+                           r'(?:\[\s*weight\s*=\s*(-?(?:\.\d+|\d+(?:\.\d*)?))\s*\]\s*)?;|(' + DOT_TOKEN + '))',
+                           re.DOTALL)
+
+def parseDotValue(token):
+    if token[0] == '"':
+        return token[1:-1].replace('\\"', '"')
+    try:
+        return int(token)
+    except ValueError:
+        try:
+            return float(token)
+        except ValueError:
+            return token
+
+def parseDotEdges(f, chunk_size=1 << 20):
+    buffer = f.read(chunk_size)
+    while '{' not in buffer:
+        chunk = f.read(chunk_size)
+        if not chunk:
+            break
+        buffer += chunk
+    header = DOT_HEADER.match(buffer)
+    if header is None:
+        raise ValueError("Invalid GraphViz file format.")
+    buffer = buffer[header.end():]
+
+    # node ids repeat on many lines, so each distinct token is only converted once
+    values = {}
+    # node ids of the current statement, consecutive ones are joined by an edge
+    chain = []
+    weight = 1
+    after_edge = False
+    # the id after "=" or ":" is an attribute value or a port, not a node
+    skip_id = False
+    in_attributes = False
+    key = None
+    after_equals = False
+    while True:
+        chunk = f.read(chunk_size)
+        cut = max(buffer.rfind(';'), buffer.rfind('\n')) + 1 if chunk else len(buffer)
+        matches = DOT_STATEMENT.findall(buffer, 0, cut)
+        if chunk and matches and matches[-1][3]:
+            # the last token may continue in the next chunk, so it is read again with it
+            cut = buffer.rfind(matches.pop()[3], 0, cut)
+        for token1, token2, edge_weight, token in matches:
+            if token1:
+                data1 = values.get(token1)
+                if data1 is None:
+                    data1 = values[token1] = parseDotValue(token1)
+                data2 = values.get(token2)
+                if data2 is None:
+                    data2 = values[token2] = parseDotValue(token2)
+                edge_weight = parseDotValue(edge_weight) if edge_weight else 1
+                if after_edge:
+                    # the statement began before this match, e.g. "a --" on the previous line
+                    chain.append(data1)
+                    chain.append(data2)
+                    for i in range(1, len(chain)):
+                        yield chain[i - 1], chain[i], edge_weight
+                else:
+                    for i in range(1, len(chain)):
+                        yield chain[i - 1], chain[i], weight
+                    yield data1, data2, edge_weight
+                chain = []
+                weight = 1
+                after_edge = False
+            elif token[0] == '/' or token[0] == '#':
+                continue
+            elif in_attributes:
+                if token == ']':
+                    in_attributes = False
+                    key = None
+                    after_equals = False
+                elif token == '=':
+                    after_equals = key is not None
+                elif token == ',' or token == ';':
+                    key = None
+                    after_equals = False
+                elif not after_equals:
+                    key = token
+                else:
+                    # only a weight key counts, a weight inside some other value is just text
+                    if key == 'weight' or key == '"weight"':
+                        weight = parseDotValue(token[1:-1] if token[0] == '"' else token)
+                    key = None
+                    after_equals = False
+            elif token == '--' or token == '->':
+                after_edge = True
+            elif token == '[':
+                in_attributes = True
+            elif token == '=' or token == ':':
+                skip_id = True
+            elif token == ';' or token == ',' or token == '{' or token == '}':
+                for i in range(1, len(chain)):
+                    yield chain[i - 1], chain[i], weight
+                chain = []
+                weight = 1
+                after_edge = False
+            elif skip_id:
+                skip_id = False
+            else:
+                data = values.get(token)
+                if data is None:
+                    data = values[token] = parseDotValue(token)
+                if after_edge:
+                    chain.append(data)
+                    after_edge = False
+                else:
+                    # an id that does not follow "--" starts the next statement
+                    for i in range(1, len(chain)):
+                        yield chain[i - 1], chain[i], weight
+                    chain = [data]
+                    weight = 1
+        if not chunk:
+            break
+        buffer = buffer[cut:] + chunk
+    for i in range(1, len(chain)):
+        yield chain[i - 1], chain[i], weight
+
+# Per-call record of an instrumented algorithm: named counters, seconds spent in each phase and,
+# when memory tracing is on, the peak bytes allocated during the call
+class Stats:
+    def __init__(self, name):
+        self.name = name
+        self.counters = {}
+        self.phases = {}
+        self.peak_memory = None
+        self.phaseStart = time.perf_counter()
+        self.baseMemory = tracemalloc.get_traced_memory()[0] if tracemalloc.is_tracing() else 0
+
+    # closes the running phase under the given name and starts the next one
+    def phase(self, name):
+        now = time.perf_counter()
+        self.phases[name] = self.phases.get(name, 0) + now - self.phaseStart
+        self.phaseStart = now
+
+    def asDict(self):
+        return {'name': self.name, 'counters': dict(self.counters), 'phases': dict(self.phases),
+                'peak_memory': self.peak_memory}
+
+# Opt-in instrumentation for the graph classes. Algorithms only create a Stats object after
+# enableStats, so a disabled graph pays one attribute check per call. The last Stats is kept in
+# self.stats and also handed to the callback, e.g. to export it to a metrics pipeline.
+class Instrumented:
+    statsEnabled = False
+    statsCallback = None
+    traceMemory = False
+    startedTracing = False
+    stats = None
+
+    def enableStats(self, callback=None, trace_memory=False):
+        self.statsEnabled = True
+        self.statsCallback = callback
+        # tracemalloc slows every allocation down, so peak memory is only measured on request
+        self.traceMemory = trace_memory
+        if trace_memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.startedTracing = True
+
+    def disableStats(self):
+        self.statsEnabled = False
+        self.statsCallback = None
+        self.traceMemory = False
+        if self.startedTracing:
+            tracemalloc.stop()
+            self.startedTracing = False
+
+    def startStats(self, name):
+        if not self.statsEnabled:
+            return None
+        if self.traceMemory:
+            tracemalloc.reset_peak()
+        return Stats(name)
+
+    def finishStats(self, stats, **counters):
+        stats.counters.update(counters)
+        if self.traceMemory:
+            stats.peak_memory = tracemalloc.get_traced_memory()[1] - stats.baseMemory
+        self.stats = stats
+        if self.statsCallback is not None:
+            self.statsCallback(stats)
+
+# Disjoint-set forest over dense int ids kept in flat arrays, with union by size and iterative
+# path compression, so find never recurses and is effectively O(1)
+class DisjointSet:
+    def __init__(self, size=0, count_steps=False):
+        self.parent = array('i', range(size))
+        self.size = array('i', [1]) * size
+        # number of disjoint sets
+        self.count = size
+        # with count_steps every find goes through countingFind, which adds the calls and the
+        # parent links walked to reach the root, so union-find depth shows up in the MST stats
+        self.finds = 0
+        self.findSteps = 0
+        if count_steps:
+            self.find = self.countingFind
+
+    def add(self):
+        self.parent.append(len(self.parent))
+        self.size.append(1)
+        self.count += 1
+        return len(self.parent) - 1
+
+    def find(self, x):
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def countingFind(self, x):
+        parent = self.parent
+        self.finds += 1
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+            self.findSteps += 1
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+
+    def union(self, x, y):
+        root1 = self.find(x)
+        root2 = self.find(y)
+        if root1 == root2:
+            return False
+        if self.size[root1] < self.size[root2]:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.size[root1] += self.size[root2]
+        self.count -= 1
+        return True
+
+    def connected(self, x, y):
+        return self.find(x) == self.find(y)
+
+# Connected components of an undirected graph on top of a DisjointSet of dense node ids. The
+# structure is built on the first query and then follows addNode/addEdge incrementally; removals
+# only drop it, so the next query rebuilds it. The graph provides nodeList and neighbors().
+class Components:
+    disjointSet = None
+    componentIds = None
+
+    def componentSet(self):
+        if self.disjointSet is None:
+            nodes = self.nodeList
+            ids = {node: i for i, node in enumerate(nodes)}
+            disjoint_set = DisjointSet(len(nodes))
+            union = disjoint_set.union
+            for i, node in enumerate(nodes):
+                for neighbor, _ in self.neighbors(node):
+                    # each undirected edge is listed at both ends, once is enough
+                    j = ids[neighbor]
+                    if i < j:
+                        union(i, j)
+            self.componentIds = ids
+            self.disjointSet = disjoint_set
+        return self.disjointSet
+
+    def trackNode(self, node):
+        if self.disjointSet is not None:
+            self.componentIds[node] = self.disjointSet.add()
+
+    def trackEdge(self, n1, n2):
+        if self.disjointSet is not None:
+            self.disjointSet.union(self.componentIds[n1], self.componentIds[n2])
+
+    # In the matrix graphs writing a weight of 0 removes the edge
+    def trackMatrixEdge(self, n1, n2, weight):
+        if weight == 0:
+            self.resetComponents()
+        else:
+            self.trackEdge(n1, n2)
+
+    def resetComponents(self):
+        self.disjointSet = None
+        self.componentIds = None
+
+    # One bool per (n1, n2) pair
+    def connected(self, pairs):
+        disjoint_set = self.componentSet()
+        ids = self.componentIds
+        find = disjoint_set.find
+        return [find(ids[n1]) == find(ids[n2]) for n1, n2 in pairs]
+
+    def componentCount(self):
+        return self.componentSet().count
+
+    # Lists of nodes, one per component
+    def components(self):
+        disjoint_set = self.componentSet()
+        find = disjoint_set.find
+        groups = {}
+        for node, i in self.componentIds.items():
+            groups.setdefault(find(i), []).append(node)
+        return list(groups.values())
+
+class GraphNode:
+    def __init__(self, data):
+        self.data = data
+
+    def equals(self, node):
+        if(node.data == self.data):
+            return True
+        return False
+
+# Undirected adjacency-list graph the exercises subclass with their algorithms
+class AdjacencyGraph(Components):
+    def __init__(self, keyed=False):
+        # keyed mode keeps each node's neighbors in a {neighbor: weight} dict so removals are
+        # O(degree); dicts keep insertion order, so traversal order stays deterministic
+        self.keyed = keyed
+        self.adjacency_list = {}
+        self._nodeList = None
+        self.nodeIndex = {}
+        # bumped by every mutation, so derived data can be tagged with it
+        self.version = 0
+
+    # nodeList follows adjacency_list order and is rebuilt only after nodes change
+    @property
+    def nodeList(self):
+        if self._nodeList is None:
+            self._nodeList = list(self.adjacency_list)
+        return self._nodeList
+
+    def neighbors(self, node):
+        if self.keyed:
+            return self.adjacency_list[node].items()
+        return self.adjacency_list[node]
+
+    def addNode(self, data):
+        # nodeIndex maps data -> node so lookup-or-create is O(1)
+        node = self.nodeIndex.get(data)
+        if node is not None:
+            return node
+
+        node = GraphNode(data)
+        self.nodeIndex[data] = node
+        self.adjacency_list[node] = {} if self.keyed else []
+        self._nodeList = None
+        self.version += 1
+        self.trackNode(node)
+        return node
+
+    def addNodes(self, data_list):
+        return [self.addNode(data) for data in data_list]
+
+    def removeNode(self, node):
+        if node in self.adjacency_list:
+            # only the lists of the node's own neighbors can refer to it
+            for neighbor in {neighbor for neighbor, _ in self.neighbors(node)}:
+                if neighbor is node:
+                    continue
+                if self.keyed:
+                    del self.adjacency_list[neighbor][node]
+                else:
+                    self.adjacency_list[neighbor] = [(n, weight) for n, weight in self.adjacency_list[neighbor] if n != node]
+            del self.adjacency_list[node]
+            self._nodeList = None
+            self.version += 1
+            self.resetComponents()
+            if self.nodeIndex.get(node.data) is node:
+                del self.nodeIndex[node.data]
+
+    def addEdge(self, n1, n2, weight=1):
+        if n1 in self.adjacency_list and n2 in self.adjacency_list:
+            if self.keyed:
+                self.adjacency_list[n1][n2] = weight
+                self.adjacency_list[n2][n1] = weight
+            else:
+                self.adjacency_list[n1].append((n2, weight))
+                self.adjacency_list[n2].append((n1, weight))
+            self.version += 1
+            self.trackEdge(n1, n2)
+
+    def addEdges(self, edges):
+        # bulk insert of (u, v, weight) tuples, creating nodes from their data as needed
+        adjacency_list = self.adjacency_list
+        addNode = self.addNode
+        for data1, data2, weight in edges:
+            n1 = addNode(data1)
+            n2 = addNode(data2)
+            if self.keyed:
+                adjacency_list[n1][n2] = weight
+                adjacency_list[n2][n1] = weight
+            else:
+                adjacency_list[n1].append((n2, weight))
+                adjacency_list[n2].append((n1, weight))
+            if self.disjointSet is not None:
+                self.trackEdge(n1, n2)
+        self.version += 1
+
+    def removeEdge(self, n1, n2):
+        if n1 in self.adjacency_list and n2 in self.adjacency_list:
+            self.version += 1
+            self.resetComponents()
+            if self.keyed:
+                self.adjacency_list[n1].pop(n2, None)
+                self.adjacency_list[n2].pop(n1, None)
+            else:
+                self.adjacency_list[n1] = [(node, weight) for node, weight in self.adjacency_list[n1] if node != n2]
+                self.adjacency_list[n2] = [(node, weight) for node, weight in self.adjacency_list[n2] if node != n1]
+
+    def importFromFile(self, file):
+        self.adjacency_list = {}
+        self._nodeList = None
+        self.nodeIndex = {}
+        self.version += 1
+        self.resetComponents()
+        try:
+            with open(file, 'r') as f:
+                self.addEdges(parseDotEdges(f))
+            print("Graph imported successfully.")
+            return self
+
+        except FileNotFoundError:
+            print("File not found.")
+            return None
+        except ValueError:
+            print("Invalid GraphViz file format.")
+            return None
+
+# Immutable compressed-sparse-row graph: nodes are dense ids, the neighbors of node i are
+# targets[offsets[i]:offsets[i + 1]] with matching weights. Each exercise subclasses it with
+# the algorithms it runs on the arrays.
+class CSRBase(Instrumented):
+    def __init__(self, nodes, offsets, targets, weights):
+        self.nodes = nodes
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+        self.ids = {node: i for i, node in enumerate(nodes)}
+
+    def nodeId(self, node):
+        return self.ids[node]
+
+# CSR arrays (nodes, offsets, targets, weights) of an adjacency-list graph, ids follow
+# adjacency_list order and every entry of neighbors() is stored
+def csrArrays(graph):
+    ids = {node: i for i, node in enumerate(graph.adjacency_list)}
+    offsets = array('q', [0])
+    targets = array('i')
+    weights = []
+    for node in graph.adjacency_list:
+        for neighbor, weight in graph.neighbors(node):
+            targets.append(ids[neighbor])
+            weights.append(weight)
+        offsets.append(len(targets))
+    return [node.data for node in graph.adjacency_list], offsets, targets, array(weightTypecode(weights), weights)